@@ -7,32 +7,61 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
 from .const import (
+    CONFIG_CONNECT_TIMEOUT,
     CONFIG_ENABLE_DEBUG_LOGGING,
+    CONFIG_HOST_ADDRESS,
+    CONFIG_HOST_PORT,
+    CONFIG_IDLE_TIMEOUT,
+    CONFIG_READ_TIMEOUT,
+    CONFIG_TRANSPORT,
     CONFIG_UPDATE_INTERVAL,
+    CONFIG_UPDATE_INTERVAL_FAST,
+    CONFIG_UPDATE_MODE,
     DOMAIN,
+    STORAGE_VERSION,
     CONFIG_AUTH_TOKEN,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    TRANSPORT_HTTP,
+    UPDATE_MODE_SLOW,
 )
-from .mining_rig import MiningRig
+from .mining_rig import MiningRig, PublishThrottle, ThermalGovernor
+from .scheduler import async_get_scheduler
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
 
 PLATFORMS = [Platform.SENSOR, Platform.SWITCH, Platform.SELECT]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the services of the integration."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Set up a config entry."""
 
-    mining_rig = MiningRig(hass, config_entry)
-    await mining_rig.update()
+    mining_rig = MiningRig(hass, config_entry, async_get_scheduler(hass))
+    # entities are created from the stored inventory, the first poll reconciles
+    await mining_rig.async_load()
 
     hass.data.setdefault(DOMAIN, {})[config_entry.entry_id] = mining_rig
 
     config_entry.async_on_unload(config_entry.add_update_listener(update_config))
 
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+    mining_rig.async_scheduled_update()
     return True
 
 
@@ -43,10 +72,18 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
         config_entry, PLATFORMS
     )
     if unload_ok:
-        hass.data[DOMAIN].pop(config_entry.entry_id)
+        mining_rig: MiningRig = hass.data[DOMAIN].pop(config_entry.entry_id)
+        await mining_rig.close()
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the stored inventory of a removed config entry."""
+    await Store(
+        hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}"
+    ).async_remove()
+
+
 async def async_migrate_entry(hass, config_entry: ConfigEntry):
     """Migrate old entry."""
     _LOGGER.debug("Migrating from version %s", config_entry.version)
@@ -67,7 +104,23 @@ async def async_migrate_entry(hass, config_entry: ConfigEntry):
 async def update_config(hass, config_entry: ConfigEntry) -> None:
     """Handle options update."""
     mining_rig: MiningRig = hass.data[DOMAIN][config_entry.entry_id]
-    update_interval = config_entry.data.get(CONFIG_UPDATE_INTERVAL)
-    auth_token = config_entry.data.get(CONFIG_AUTH_TOKEN)
-    mining_rig.set_update_interval(hass, update_interval)
-    mining_rig.update_auth_token(auth_token)
+    mining_rig.set_update_intervals(
+        config_entry.data.get(CONFIG_UPDATE_INTERVAL),
+        config_entry.data.get(CONFIG_UPDATE_INTERVAL_FAST),
+    )
+    mining_rig.set_update_mode(
+        config_entry.data.get(CONFIG_UPDATE_MODE, UPDATE_MODE_SLOW)
+    )
+    mining_rig.publish_throttle = PublishThrottle.from_config(config_entry.data)
+    mining_rig.thermal_governor = ThermalGovernor.from_config(config_entry.data)
+    mining_rig.set_idle_timeout(
+        config_entry.data.get(CONFIG_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT)
+    )
+    await mining_rig.update_connection(
+        config_entry.data.get(CONFIG_HOST_ADDRESS),
+        config_entry.data.get(CONFIG_HOST_PORT),
+        config_entry.data.get(CONFIG_AUTH_TOKEN),
+        config_entry.data.get(CONFIG_TRANSPORT, TRANSPORT_HTTP),
+        config_entry.data.get(CONFIG_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT),
+        config_entry.data.get(CONFIG_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+    )
@@ -17,23 +17,56 @@ from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
 from .const import (
+    CONFIG_CONNECT_TIMEOUT,
+    CONFIG_MAX_PUBLISH_AGE,
+    CONFIG_MIN_PUBLISH_INTERVAL,
     CONFIG_ENABLE_DEBUG_LOGGING,
+    CONFIG_GOVERNOR,
+    CONFIG_GOVERNOR_HOTSPOT_TEMPERATURE,
+    CONFIG_GOVERNOR_HYSTERESIS,
+    CONFIG_GOVERNOR_TEMPERATURE,
     CONFIG_HOST_ADDRESS,
     CONFIG_HOST_PORT,
+    CONFIG_IDLE_TIMEOUT,
     CONFIG_AUTH_TOKEN,
     CONFIG_NAME,
+    CONFIG_READ_TIMEOUT,
+    CONFIG_TRANSPORT,
     CONFIG_UPDATE_INTERVAL,
     CONFIG_UPDATE_INTERVAL_FAST,
+    CONFIG_UPDATE_MODE,
+    DEADBANDS,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_GOVERNOR_HOTSPOT_TEMPERATURE,
+    DEFAULT_GOVERNOR_HYSTERESIS,
+    DEFAULT_GOVERNOR_TEMPERATURE,
     DEFAULT_HOST_PORT,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_MAX_PUBLISH_AGE,
+    DEFAULT_READ_TIMEOUT,
     DEFAULT_UPDATE_INTERVAL,
     DEFAULT_UPDATE_INTERVAL_FAST,
     DOMAIN,
     ERROR_CANNOT_CONNECT,
+    ERROR_INVALID_GOVERNOR,
+    ERROR_INVALID_IDLE_TIMEOUT,
+    ERROR_INVALID_PUBLISH_LIMIT,
     ERROR_INVALID_PORT,
+    ERROR_INVALID_TIMEOUT,
     ERROR_INVALID_UPDATE_INTERVAL,
     ERROR_NO_RESPONSE,
+    MAX_GOVERNOR_HYSTERESIS,
+    MAX_GOVERNOR_TEMPERATURE,
+    MAX_IDLE_TIMEOUT,
+    MAX_PUBLISH_AGE,
+    MAX_TIMEOUT,
     MAX_UPDATE_INTERVAL,
+    MIN_GOVERNOR_TEMPERATURE,
     MIN_UPDATE_INTERVAL,
+    TRANSPORT_HTTP,
+    TRANSPORT_TCP,
+    UPDATE_MODE_SLOW,
+    UPDATE_MODES,
 )
 from .excavator import ExcavatorAPI
 
@@ -44,25 +77,41 @@ MAIN_DATA_SCHEMA = {
     vol.Required(CONFIG_HOST_ADDRESS): str,
     vol.Required(CONFIG_HOST_PORT, default=DEFAULT_HOST_PORT): int,
     vol.Optional(CONFIG_AUTH_TOKEN, default=""): str,
+    vol.Required(CONFIG_TRANSPORT, default=TRANSPORT_HTTP): vol.In(
+        [TRANSPORT_HTTP, TRANSPORT_TCP]
+    ),
     vol.Required(CONFIG_UPDATE_INTERVAL, default=DEFAULT_UPDATE_INTERVAL): int,
     vol.Required(
         CONFIG_UPDATE_INTERVAL_FAST, default=DEFAULT_UPDATE_INTERVAL_FAST
     ): int,
+    vol.Required(CONFIG_UPDATE_MODE, default=UPDATE_MODE_SLOW): vol.In(UPDATE_MODES),
+    vol.Required(CONFIG_CONNECT_TIMEOUT, default=DEFAULT_CONNECT_TIMEOUT): int,
+    vol.Required(CONFIG_READ_TIMEOUT, default=DEFAULT_READ_TIMEOUT): int,
+    vol.Required(CONFIG_IDLE_TIMEOUT, default=DEFAULT_IDLE_TIMEOUT): int,
 }
 
 
 async def get_errors(data: dict) -> dict[str, any]:
     """Validate the user input"""
     errors = await validate_update_intervals(data)
+    errors.update(await validate_timeouts(data))
+    errors.update(await validate_idle_timeout(data))
+    errors.update(await validate_publish_limits(data))
+    errors.update(await validate_governor(data))
 
     if data[CONFIG_HOST_PORT] < 1 or data[CONFIG_HOST_PORT] > 65535:
         _LOGGER.error(ERROR_INVALID_PORT)
         errors[CONFIG_HOST_PORT] = ERROR_INVALID_PORT
 
+    excavator = ExcavatorAPI(
+        data[CONFIG_HOST_ADDRESS],
+        data[CONFIG_HOST_PORT],
+        data[CONFIG_AUTH_TOKEN],
+        transport=data[CONFIG_TRANSPORT],
+        connect_timeout=data[CONFIG_CONNECT_TIMEOUT],
+        read_timeout=data[CONFIG_READ_TIMEOUT],
+    )
     try:
-        excavator = ExcavatorAPI(
-            data[CONFIG_HOST_ADDRESS], data[CONFIG_HOST_PORT], data[CONFIG_AUTH_TOKEN]
-        )
         result = await excavator.test_connection()
         if not result:
             _LOGGER.error(ERROR_NO_RESPONSE)
@@ -71,6 +120,8 @@ async def get_errors(data: dict) -> dict[str, any]:
         _LOGGER.error(err)
         errors[CONFIG_HOST_ADDRESS] = ERROR_CANNOT_CONNECT
         errors[CONFIG_HOST_PORT] = ERROR_CANNOT_CONNECT
+    finally:
+        await excavator.close()
 
     return errors
 
@@ -95,6 +146,70 @@ async def validate_update_intervals(data: dict) -> dict[str, any]:
     return errors
 
 
+async def validate_timeouts(data: dict) -> dict[str, any]:
+    """Validate the user input"""
+    errors = {}
+    for key in (CONFIG_CONNECT_TIMEOUT, CONFIG_READ_TIMEOUT):
+        if data[key] < 1 or data[key] > MAX_TIMEOUT:
+            _LOGGER.error(ERROR_INVALID_TIMEOUT)
+            errors[key] = ERROR_INVALID_TIMEOUT
+
+    return errors
+
+
+async def validate_idle_timeout(data: dict) -> dict[str, any]:
+    """Validate the user input"""
+    errors = {}
+    if data[CONFIG_IDLE_TIMEOUT] < 0 or data[CONFIG_IDLE_TIMEOUT] > MAX_IDLE_TIMEOUT:
+        _LOGGER.error(ERROR_INVALID_IDLE_TIMEOUT)
+        errors[CONFIG_IDLE_TIMEOUT] = ERROR_INVALID_IDLE_TIMEOUT
+
+    return errors
+
+
+async def validate_publish_limits(data: dict) -> dict[str, any]:
+    """Validate the user input, the limits are only set in the options"""
+    errors = {}
+    for key in DEADBANDS:
+        if data.get(key, 0) < 0:
+            _LOGGER.error(ERROR_INVALID_PUBLISH_LIMIT)
+            errors[key] = ERROR_INVALID_PUBLISH_LIMIT
+
+    min_interval = data.get(CONFIG_MIN_PUBLISH_INTERVAL, 0)
+    max_age = data.get(CONFIG_MAX_PUBLISH_AGE, DEFAULT_MAX_PUBLISH_AGE)
+    if min_interval < 0 or min_interval > max_age:
+        _LOGGER.error(ERROR_INVALID_PUBLISH_LIMIT)
+        errors[CONFIG_MIN_PUBLISH_INTERVAL] = ERROR_INVALID_PUBLISH_LIMIT
+    if max_age < 1 or max_age > MAX_PUBLISH_AGE:
+        _LOGGER.error(ERROR_INVALID_PUBLISH_LIMIT)
+        errors[CONFIG_MAX_PUBLISH_AGE] = ERROR_INVALID_PUBLISH_LIMIT
+
+    return errors
+
+
+async def validate_governor(data: dict) -> dict[str, any]:
+    """Validate the user input, the governor is only set in the options"""
+    errors = {}
+    for key, default in (
+        (CONFIG_GOVERNOR_TEMPERATURE, DEFAULT_GOVERNOR_TEMPERATURE),
+        (CONFIG_GOVERNOR_HOTSPOT_TEMPERATURE, DEFAULT_GOVERNOR_HOTSPOT_TEMPERATURE),
+    ):
+        temperature = data.get(key, default)
+        if (
+            temperature < MIN_GOVERNOR_TEMPERATURE
+            or temperature > MAX_GOVERNOR_TEMPERATURE
+        ):
+            _LOGGER.error(ERROR_INVALID_GOVERNOR)
+            errors[key] = ERROR_INVALID_GOVERNOR
+
+    hysteresis = data.get(CONFIG_GOVERNOR_HYSTERESIS, DEFAULT_GOVERNOR_HYSTERESIS)
+    if hysteresis < 1 or hysteresis > MAX_GOVERNOR_HYSTERESIS:
+        _LOGGER.error(ERROR_INVALID_GOVERNOR)
+        errors[CONFIG_GOVERNOR_HYSTERESIS] = ERROR_INVALID_GOVERNOR
+
+    return errors
+
+
 class MainConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Nicehash Excavator Integration."""
 
@@ -140,10 +255,29 @@ class OptionsFlowHandler(OptionsFlow):
                 new[CONFIG_HOST_ADDRESS] = user_input[CONFIG_HOST_ADDRESS]
                 new[CONFIG_HOST_PORT] = user_input[CONFIG_HOST_PORT]
                 new[CONFIG_AUTH_TOKEN] = user_input[CONFIG_AUTH_TOKEN]
+                new[CONFIG_TRANSPORT] = user_input[CONFIG_TRANSPORT]
                 new[CONFIG_UPDATE_INTERVAL] = user_input[CONFIG_UPDATE_INTERVAL]
                 new[CONFIG_UPDATE_INTERVAL_FAST] = user_input[
                     CONFIG_UPDATE_INTERVAL_FAST
                 ]
+                new[CONFIG_UPDATE_MODE] = user_input[CONFIG_UPDATE_MODE]
+                new[CONFIG_CONNECT_TIMEOUT] = user_input[CONFIG_CONNECT_TIMEOUT]
+                new[CONFIG_READ_TIMEOUT] = user_input[CONFIG_READ_TIMEOUT]
+                new[CONFIG_IDLE_TIMEOUT] = user_input[CONFIG_IDLE_TIMEOUT]
+                new[CONFIG_MIN_PUBLISH_INTERVAL] = user_input[
+                    CONFIG_MIN_PUBLISH_INTERVAL
+                ]
+                new[CONFIG_MAX_PUBLISH_AGE] = user_input[CONFIG_MAX_PUBLISH_AGE]
+                for key in DEADBANDS:
+                    new[key] = user_input[key]
+                new[CONFIG_GOVERNOR] = user_input[CONFIG_GOVERNOR]
+                new[CONFIG_GOVERNOR_TEMPERATURE] = user_input[
+                    CONFIG_GOVERNOR_TEMPERATURE
+                ]
+                new[CONFIG_GOVERNOR_HOTSPOT_TEMPERATURE] = user_input[
+                    CONFIG_GOVERNOR_HOTSPOT_TEMPERATURE
+                ]
+                new[CONFIG_GOVERNOR_HYSTERESIS] = user_input[CONFIG_GOVERNOR_HYSTERESIS]
                 # new[CONFIG_ENABLE_DEBUG_LOGGING] = user_input[
                 #    CONFIG_ENABLE_DEBUG_LOGGING
                 # ]
@@ -166,6 +300,12 @@ class OptionsFlowHandler(OptionsFlow):
                         CONFIG_AUTH_TOKEN,
                         default=self.config_entry.data.get(CONFIG_AUTH_TOKEN),
                     ): str,
+                    vol.Required(
+                        CONFIG_TRANSPORT,
+                        default=self.config_entry.data.get(
+                            CONFIG_TRANSPORT, TRANSPORT_HTTP
+                        ),
+                    ): vol.In([TRANSPORT_HTTP, TRANSPORT_TCP]),
                     vol.Required(
                         CONFIG_UPDATE_INTERVAL,
                         default=self.config_entry.data.get(CONFIG_UPDATE_INTERVAL),
@@ -174,6 +314,71 @@ class OptionsFlowHandler(OptionsFlow):
                         CONFIG_UPDATE_INTERVAL_FAST,
                         default=self.config_entry.data.get(CONFIG_UPDATE_INTERVAL_FAST),
                     ): int,
+                    vol.Required(
+                        CONFIG_UPDATE_MODE,
+                        default=self.config_entry.data.get(
+                            CONFIG_UPDATE_MODE, UPDATE_MODE_SLOW
+                        ),
+                    ): vol.In(UPDATE_MODES),
+                    vol.Required(
+                        CONFIG_CONNECT_TIMEOUT,
+                        default=self.config_entry.data.get(
+                            CONFIG_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT
+                        ),
+                    ): int,
+                    vol.Required(
+                        CONFIG_READ_TIMEOUT,
+                        default=self.config_entry.data.get(
+                            CONFIG_READ_TIMEOUT, DEFAULT_READ_TIMEOUT
+                        ),
+                    ): int,
+                    vol.Required(
+                        CONFIG_IDLE_TIMEOUT,
+                        default=self.config_entry.data.get(
+                            CONFIG_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT
+                        ),
+                    ): int,
+                    vol.Required(
+                        CONFIG_MIN_PUBLISH_INTERVAL,
+                        default=self.config_entry.data.get(
+                            CONFIG_MIN_PUBLISH_INTERVAL, 0
+                        ),
+                    ): int,
+                    vol.Required(
+                        CONFIG_MAX_PUBLISH_AGE,
+                        default=self.config_entry.data.get(
+                            CONFIG_MAX_PUBLISH_AGE, DEFAULT_MAX_PUBLISH_AGE
+                        ),
+                    ): int,
+                    **{
+                        vol.Required(
+                            key, default=self.config_entry.data.get(key, 0)
+                        ): vol.Coerce(float)
+                        for key in DEADBANDS
+                    },
+                    vol.Required(
+                        CONFIG_GOVERNOR,
+                        default=self.config_entry.data.get(CONFIG_GOVERNOR, False),
+                    ): bool,
+                    vol.Required(
+                        CONFIG_GOVERNOR_TEMPERATURE,
+                        default=self.config_entry.data.get(
+                            CONFIG_GOVERNOR_TEMPERATURE, DEFAULT_GOVERNOR_TEMPERATURE
+                        ),
+                    ): int,
+                    vol.Required(
+                        CONFIG_GOVERNOR_HOTSPOT_TEMPERATURE,
+                        default=self.config_entry.data.get(
+                            CONFIG_GOVERNOR_HOTSPOT_TEMPERATURE,
+                            DEFAULT_GOVERNOR_HOTSPOT_TEMPERATURE,
+                        ),
+                    ): int,
+                    vol.Required(
+                        CONFIG_GOVERNOR_HYSTERESIS,
+                        default=self.config_entry.data.get(
+                            CONFIG_GOVERNOR_HYSTERESIS, DEFAULT_GOVERNOR_HYSTERESIS
+                        ),
+                    ): int,
                     # vol.Optional(
                     #    CONFIG_ENABLE_DEBUG_LOGGING,
                     #    default=self.config_entry.data.get(CONFIG_ENABLE_DEBUG_LOGGING),
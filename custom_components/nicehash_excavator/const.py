@@ -7,23 +7,98 @@ DEFAULT_HOST_PORT = 18000
 DEFAULT_UPDATE_INTERVAL = 60
 DEFAULT_UPDATE_INTERVAL_FAST = 1
 
+CONNECTION_LIMIT_PER_HOST = 4
+CONNECTION_KEEPALIVE_TIMEOUT = 30
+MAX_CONCURRENT_REQUESTS = 16
+# longest response line of the TCP API, devices.get of a large rig exceeds 64 KiB
+TCP_READ_LIMIT = 2**20
+
 MAX_UPDATE_INTERVAL = 3600
 MIN_UPDATE_INTERVAL = 1
+MAX_BACKOFF_INTERVAL = 300
+
+# adaptive polling is fast while a value changes by more or a GPU is this hot
+ADAPTIVE_TEMPERATURE_DELTA = 2
+ADAPTIVE_HASHRATE_DELTA = 0.05
+ADAPTIVE_HOT_TEMPERATURE = 80
+
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 10
+MAX_TIMEOUT = 60
+CIRCUIT_BREAKER_THRESHOLD = 3
+CIRCUIT_BREAKER_PROBE_INTERVAL = 5
+
+HISTORY_SIZE = 60
+HISTORY_EMA_ALPHA = 0.1
+
+DEFAULT_MAX_PUBLISH_AGE = 300
+MAX_PUBLISH_AGE = 86400
+
+DEFAULT_IDLE_TIMEOUT = 60
+MAX_IDLE_TIMEOUT = 10080
+
+# the thermal governor stops a GPU at a temperature, resumes below by hysteresis
+DEFAULT_GOVERNOR_TEMPERATURE = 85
+DEFAULT_GOVERNOR_HOTSPOT_TEMPERATURE = 100
+DEFAULT_GOVERNOR_HYSTERESIS = 10
+MIN_GOVERNOR_TEMPERATURE = 40
+MAX_GOVERNOR_TEMPERATURE = 120
+MAX_GOVERNOR_HYSTERESIS = 30
 
 CONFIG_NAME = "name"
 CONFIG_HOST_ADDRESS = "host_address"
 CONFIG_HOST_PORT = "host_port"
 CONFIG_AUTH_TOKEN = "auth_token"
+CONFIG_TRANSPORT = "transport"
+CONFIG_CONNECT_TIMEOUT = "connect_timeout"
+CONFIG_READ_TIMEOUT = "read_timeout"
 CONFIG_UPDATE_INTERVAL = "update_interval"
 CONFIG_UPDATE_INTERVAL_FAST = "update_interval_fast"
+CONFIG_UPDATE_MODE = "update_mode"
+CONFIG_IDLE_TIMEOUT = "idle_timeout"
+CONFIG_MIN_PUBLISH_INTERVAL = "min_publish_interval"
+CONFIG_MAX_PUBLISH_AGE = "max_publish_age"
+CONFIG_GOVERNOR = "governor"
+CONFIG_GOVERNOR_TEMPERATURE = "governor_temperature"
+CONFIG_GOVERNOR_HOTSPOT_TEMPERATURE = "governor_hotspot_temperature"
+CONFIG_GOVERNOR_HYSTERESIS = "governor_hysteresis"
+CONFIG_DEADBAND_TEMPERATURE = "deadband_temperature"
+CONFIG_DEADBAND_FAN = "deadband_fan"
+CONFIG_DEADBAND_POWER = "deadband_power"
+CONFIG_DEADBAND_HASHRATE = "deadband_hashrate"
+DEADBANDS = [
+    CONFIG_DEADBAND_TEMPERATURE,
+    CONFIG_DEADBAND_FAN,
+    CONFIG_DEADBAND_POWER,
+    CONFIG_DEADBAND_HASHRATE,
+]
 
 CONFIG_ENABLE_DEBUG_LOGGING = "enable_debug_logging"
 
+TRANSPORT_HTTP = "http"
+TRANSPORT_TCP = "tcp"
+
+UPDATE_MODE_SLOW = "slow"
+UPDATE_MODE_FAST = "fast"
+UPDATE_MODE_ADAPTIVE = "adaptive"
+UPDATE_MODES = [UPDATE_MODE_SLOW, UPDATE_MODE_FAST, UPDATE_MODE_ADAPTIVE]
+
+# algorithm option of a device without worker
+ALGORITHM_NONE = "None"
+
 API = "api"
+SCHEDULER = "scheduler"
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
 MINING_RIG = "mining_rig"
 
 ERROR_CANNOT_CONNECT = "cannot_connect"
 ERROR_NO_RESPONSE = "no_response"
 ERROR_INVALID_PORT = "invalid_port"
 ERROR_INVALID_UPDATE_INTERVAL = "invalid_update_interval"
+ERROR_INVALID_TIMEOUT = "invalid_timeout"
+ERROR_INVALID_IDLE_TIMEOUT = "invalid_idle_timeout"
+ERROR_INVALID_PUBLISH_LIMIT = "invalid_publish_limit"
+ERROR_INVALID_GOVERNOR = "invalid_governor"
 ERROR_UNKNOWN = "unknown"
@@ -1,107 +1,229 @@
 """Classes that contain received data"""
 
-
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+
+def _update_fields(container, data: dict, fields: tuple) -> list[str]:
+    """Set the attributes from their data keys, return the changed ones."""
+    changed = []
+    for attribute, key in fields:
+        value = data.get(key)
+        if getattr(container, attribute) != value:
+            setattr(container, attribute, value)
+            changed.append(attribute)
+    return changed
+
+
+def _data_of_fields(container, fields: tuple) -> dict:
+    """The API data of the attributes, inverse of _update_fields."""
+    return {key: getattr(container, attribute) for attribute, key in fields}
+
+
+def update_items(
+    items: dict,
+    data_list: list[dict] | None,
+    item_type,
+    changed_fields: dict | None = None,
+) -> set:
+    """Update a dict of containers in place, return the ids that changed.
+
+    changed_fields gets the changed attributes of the updated containers by
+    id, not of the added and removed ones.
+    """
+    changed = set()
+    received = set()
+    for data in data_list or []:
+        item_id = item_type.id_from(data)
+        received.add(item_id)
+        item = items.get(item_id)
+        if item is None:
+            items[item_id] = item_type.from_data(data)
+            changed.add(item_id)
+        elif fields := item.update_from(data):
+            changed.add(item_id)
+            if changed_fields is not None:
+                changed_fields[item_id] = fields
+    for item_id in items.keys() - received:
+        del items[item_id]
+        changed.add(item_id)
+    return changed
+
+
+@dataclass(slots=True)
 class GraphicsCard:
-    """contains gpu data"""
-
-    id: int
-    name: str
-    subvendor: str
-    uuid: str
-    gpu_temp: int
-    gpu_load: int
-    gpu_load_memctrl: int
-    gpu_power_usage: float
-    gpu_fan_speed: int
-    too_hot: bool
-    vram_temp: int
-    hotspot_temp: int
-
-    def __init__(self, data=None) -> None:
-        """Init GraphicsCard."""
-        self.id = data.get("device_id") if data else "unavailable"
-        self.name = data.get("name") if data else "unavailable"
-        self.subvendor = data.get("subvendor") if data else "unavailable"
-        self.uuid = data.get("uuid") if data else "unavailable"
-        self.gpu_temp = data.get("gpu_temp") if data else "unavailable"
-        self.gpu_load = data.get("gpu_load") if data else "unavailable"
-        self.gpu_load_memctrl = data.get("gpu_load_memctrl") if data else "unavailable"
-        self.gpu_power_usage = data.get("gpu_power_usage") if data else "unavailable"
-        self.gpu_fan_speed = data.get("gpu_fan_speed") if data else "unavailable"
-        self.too_hot = data.get("too_hot") if data else "unavailable"
-        self.vram_temp = data.get("__vram_temp") if data else "unavailable"
-        self.hotspot_temp = data.get("__hotspot_temp") if data else "unavailable"
-
-
+    """contains gpu data, missing values are None"""
+
+    id: int | None = None
+    name: str | None = None
+    subvendor: str | None = None
+    uuid: str | None = None
+    gpu_temp: int | None = None
+    gpu_load: int | None = None
+    gpu_load_memctrl: int | None = None
+    gpu_power_usage: float | None = None
+    gpu_fan_speed: int | None = None
+    too_hot: bool | None = None
+    vram_temp: int | None = None
+    hotspot_temp: int | None = None
+
+    _FIELDS = (
+        ("id", "device_id"),
+        ("name", "name"),
+        ("subvendor", "subvendor"),
+        ("uuid", "uuid"),
+        ("gpu_temp", "gpu_temp"),
+        ("gpu_load", "gpu_load"),
+        ("gpu_load_memctrl", "gpu_load_memctrl"),
+        ("gpu_power_usage", "gpu_power_usage"),
+        ("gpu_fan_speed", "gpu_fan_speed"),
+        ("too_hot", "too_hot"),
+        ("vram_temp", "__vram_temp"),
+        ("hotspot_temp", "__hotspot_temp"),
+    )
+
+    @classmethod
+    def from_data(cls, data: dict) -> GraphicsCard:
+        """Create GraphicsCard from API data."""
+        card = cls()
+        card.update_from(data)
+        return card
+
+    @staticmethod
+    def id_from(data: dict) -> int | None:
+        """Id of the API data."""
+        return data.get("device_id")
+
+    def update_from(self, data: dict) -> list[str]:
+        """Update in place, return the changed attributes."""
+        return _update_fields(self, data, self._FIELDS)
+
+    def as_data(self) -> dict:
+        """API data of the container, to store and restore it."""
+        return _data_of_fields(self, self._FIELDS)
+
+
+@dataclass(slots=True)
 class Algorithm:
-    """contains algorithm data"""
-
-    id: int
-    name: str
-    speed: float
-
-    def __init__(self, data=None) -> None:
-        """Init Algorithm."""
-        self.name = data.get("name") if data else "unavailable"
-
+    """contains algorithm data, missing values are None"""
+
+    id: int | None = None
+    name: str | None = None
+    speed: float | None = None
+
+    _FIELDS = (
+        ("name", "name"),
+        ("speed", "speed"),
+    )
+
+    @classmethod
+    def from_data(cls, data: dict) -> Algorithm:
+        """Create Algorithm from API data."""
+        algorithm = cls()
+        algorithm.update_from(data)
+        return algorithm
+
+    @staticmethod
+    def id_from(data: dict) -> int | None:
+        """Id of the API data, algorithm.list and worker.list use other keys."""
         if "algorithm_id" in data:
-            self.id = data.get("algorithm_id")
-        else:
-            if "id" in data:
-                self.id = data.get("id")
-            else:
-                self.id = "unavailable"
-
-        if "speed" in data:
-            self.speed = data.get("speed")
-        else:
-            self.speed = "unavailable"
+            return data.get("algorithm_id")
+        return data.get("id")
 
+    def update_from(self, data: dict) -> bool:
+        """Update in place, return True if a value changed."""
+        changed = bool(_update_fields(self, data, self._FIELDS))
+        algorithm_id = self.id_from(data)
+        if self.id != algorithm_id:
+            self.id = algorithm_id
+            changed = True
+        return changed
 
-class RigInfo:
-    """contains Rig info"""
-
-    version: str
-    build_platform: str
-    build_number: int
-    excavator_cuda_ver: int
-    driver_cuda_ver: int
-    uptime: int
-    cpu_load: float
-    ram_load: float
-
-    def __init__(self, data=None) -> None:
-        """Init RigInfo."""
-        self.version = data.get("version") if data else "unavailable"
-        self.build_platform = data.get("build_platform") if data else "unavailable"
-        self.build_number = data.get("build_number") if data else "unavailable"
-        self.excavator_cuda_ver = (
-            data.get("excavator_cuda_ver") if data else "unavailable"
-        )
-        self.driver_cuda_ver = data.get("driver_cuda_ver") if data else "unavailable"
-        self.uptime = data.get("uptime") if data else "unavailable"
-        self.cpu_load = data.get("cpu_load") if data else "unavailable"
-        self.ram_load = data.get("ram_load") if data else "unavailable"
+    def as_data(self) -> dict:
+        """API data of the container, to store and restore it."""
+        return {"algorithm_id": self.id, **_data_of_fields(self, self._FIELDS)}
 
 
+@dataclass(slots=True)
+class RigInfo:
+    """contains Rig info, missing values are None"""
+
+    version: str | None = None
+    build_platform: str | None = None
+    build_number: int | None = None
+    excavator_cuda_ver: int | None = None
+    driver_cuda_ver: int | None = None
+    uptime: int | None = None
+    cpu_load: float | None = None
+    ram_load: float | None = None
+
+    _FIELDS = (
+        ("version", "version"),
+        ("build_platform", "build_platform"),
+        ("build_number", "build_number"),
+        ("excavator_cuda_ver", "excavator_cuda_ver"),
+        ("driver_cuda_ver", "driver_cuda_ver"),
+        ("uptime", "uptime"),
+        ("cpu_load", "cpu_load"),
+        ("ram_load", "ram_load"),
+    )
+
+    @classmethod
+    def from_data(cls, data: dict) -> RigInfo:
+        """Create RigInfo from API data."""
+        info = cls()
+        info.update_from(data)
+        return info
+
+    def update_from(self, data: dict) -> bool:
+        """Update in place, return True if a value changed."""
+        return bool(_update_fields(self, data, self._FIELDS))
+
+    def as_data(self) -> dict:
+        """API data of the container, to store and restore it."""
+        return _data_of_fields(self, self._FIELDS)
+
+
+@dataclass(slots=True)
 class Worker:
-    """contains Worker data"""
-
-    id: int
-    device_id: int
-    device_uuid: str
-    algorithms: dict[int, Algorithm]
-
-    def __init__(self, data=None) -> None:
-        """Init Worker."""
-        self.id = data.get("worker_id") if data else "unavailable"
-        self.device_id = data.get("device_id") if data else "unavailable"
-        self.device_uuid = data.get("device_uuid") if data else "unavailable"
-        self.algorithms = {}
-
-        if "algorithms" in data:
-            for algorithm_data in data.get("algorithms"):
-                algorithm = Algorithm(algorithm_data)
-                self.algorithms[algorithm.id] = algorithm
-        else:
-            self.algorithms = "unavailable"
+    """contains Worker data, missing values are None"""
+
+    id: int | None = None
+    device_id: int | None = None
+    device_uuid: str | None = None
+    algorithms: dict[int, Algorithm] = field(default_factory=dict)
+
+    _FIELDS = (
+        ("id", "worker_id"),
+        ("device_id", "device_id"),
+        ("device_uuid", "device_uuid"),
+    )
+
+    @classmethod
+    def from_data(cls, data: dict) -> Worker:
+        """Create Worker from API data."""
+        worker = cls()
+        worker.update_from(data)
+        return worker
+
+    @staticmethod
+    def id_from(data: dict) -> int | None:
+        """Id of the API data."""
+        return data.get("worker_id")
+
+    def update_from(self, data: dict) -> bool:
+        """Update in place, return True if a value changed."""
+        changed = bool(_update_fields(self, data, self._FIELDS))
+        if update_items(self.algorithms, data.get("algorithms"), Algorithm):
+            changed = True
+        return changed
+
+    def as_data(self) -> dict:
+        """API data of the container, to store and restore it."""
+        return {
+            **_data_of_fields(self, self._FIELDS),
+            "algorithms": [
+                algorithm.as_data() for algorithm in self.algorithms.values()
+            ],
+        }
@@ -0,0 +1,23 @@
+"""Diagnostics support for Nicehash Excavator."""
+
+from __future__ import annotations
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONFIG_AUTH_TOKEN, DOMAIN
+from .mining_rig import MiningRig
+
+TO_REDACT = {CONFIG_AUTH_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict:
+    """Return diagnostics for a config entry."""
+    mining_rig: MiningRig = hass.data[DOMAIN][config_entry.entry_id]
+    return {
+        "config_entry": async_redact_data(config_entry.data, TO_REDACT),
+        "mining_rig": mining_rig.diagnostics(),
+    }
@@ -2,15 +2,371 @@
 
 from __future__ import annotations
 
+import asyncio
+from dataclasses import dataclass
+from functools import lru_cache
+import json
 import logging
+import time
+from urllib.parse import quote, urlsplit
 
 import aiohttp
-from aiohttp.client_reqrep import ClientResponse
+import orjson
 
-from .data_containers import Algorithm, GraphicsCard, RigInfo, Worker
+from .const import (
+    CIRCUIT_BREAKER_PROBE_INTERVAL,
+    CIRCUIT_BREAKER_THRESHOLD,
+    CONNECTION_KEEPALIVE_TIMEOUT,
+    CONNECTION_LIMIT_PER_HOST,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    MAX_BACKOFF_INTERVAL,
+    TCP_READ_LIMIT,
+    TRANSPORT_HTTP,
+    TRANSPORT_TCP,
+)
+from .instrumentation import ApiStats
 
 _LOGGER = logging.getLogger(__name__)
 
+METHOD_INFO = "info"
+METHOD_DEVICES_GET = "devices.get"
+METHOD_ALGORITHM_LIST = "algorithm.list"
+METHOD_ALGORITHM_ADD = "algorithm.add"
+METHOD_WORKER_LIST = "worker.list"
+METHOD_WORKER_ADD = "worker.add"
+METHOD_WORKER_FREE = "worker.free"
+
+
+@dataclass(frozen=True, slots=True)
+class Command:
+    """A command of the Excavator API, the request id is added when sent."""
+
+    method: str
+    params: tuple[str, ...] = ()
+
+    def encode(self, request_id: int) -> str:
+        """Compact json of the command with the request id."""
+        return _payload_prefix(self) + str(request_id) + "}"
+
+
+COMMAND_INFO = Command(METHOD_INFO)
+COMMAND_DEVICES_GET = Command(METHOD_DEVICES_GET)
+COMMAND_ALGORITHM_LIST = Command(METHOD_ALGORITHM_LIST)
+COMMAND_WORKER_LIST = Command(METHOD_WORKER_LIST)
+
+# request id and command
+Query = tuple[int, Command]
+
+
+@lru_cache(maxsize=256)
+def _payload_prefix(command: Command) -> str:
+    """Json of the command up to the request id, encoded once per command."""
+    payload = json.dumps(
+        {"method": command.method, "params": list(command.params)},
+        separators=(",", ":"),
+    )
+    return payload[:-1] + ',"id":'
+
+
+class CircuitBreaker:
+    """Stops requests to an unreachable rig and probes it on a growing interval.
+
+    The breaker opens after CIRCUIT_BREAKER_THRESHOLD consecutive failures.
+    While open, requests are only let through as a probe once the probe
+    interval passed, the interval doubles with every failed probe.
+    """
+
+    STATE_CLOSED = "closed"
+    STATE_OPEN = "open"
+    STATE_HALF_OPEN = "half_open"
+
+    def __init__(self) -> None:
+        """Init CircuitBreaker."""
+        self.state = self.STATE_CLOSED
+        self.failures = 0
+        self._probe_interval = CIRCUIT_BREAKER_PROBE_INTERVAL
+        self._next_probe = 0.0
+
+    @property
+    def is_closed(self) -> bool:
+        """Return True if requests can be sent."""
+        return self.state == self.STATE_CLOSED
+
+    def try_probe(self) -> bool:
+        """Return True and switch to half open if a probe is due."""
+        if self.state == self.STATE_OPEN and time.monotonic() >= self._next_probe:
+            self.state = self.STATE_HALF_OPEN
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        self.state = self.STATE_CLOSED
+        self.failures = 0
+        self._probe_interval = CIRCUIT_BREAKER_PROBE_INTERVAL
+
+    def record_failure(self) -> None:
+        """Count a failure, open the breaker at the threshold."""
+        self.failures += 1
+        if self.state == self.STATE_HALF_OPEN:
+            self._probe_interval = min(self._probe_interval * 2, MAX_BACKOFF_INTERVAL)
+        elif self.failures < CIRCUIT_BREAKER_THRESHOLD:
+            return
+        self.state = self.STATE_OPEN
+        self._next_probe = time.monotonic() + self._probe_interval
+
+
+class ExcavatorTransport:
+    """Base class of the ways to send commands to Excavator."""
+
+    async def send(self, queries: list[Query]) -> list[dict | BaseException]:
+        """Send commands, return the responses in the same order.
+
+        A failed command returns its exception, a failed connection raises.
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Close the connection."""
+
+
+class HttpTransport(ExcavatorTransport):
+    """Commands over the HTTP watchdog API, one request per command."""
+
+    def __init__(
+        self,
+        host_address: str,
+        host_port: int,
+        auth_token: str,
+        enable_debug_logging: bool,
+        connect_timeout: float,
+        read_timeout: float,
+        stats: ApiStats,
+        session: aiohttp.ClientSession | None = None,
+    ) -> None:
+        """Init HttpTransport, a shared session is not closed by the transport."""
+        self._url = f"{host_address}:{host_port}/api"
+        # url up to the request id of the commands without params
+        self._url_prefixes: dict[Command, str] = {}
+        self._headers = {}
+        if auth_token:
+            self._headers["Authorization"] = auth_token
+        self._timeout = aiohttp.ClientTimeout(
+            sock_connect=connect_timeout, sock_read=read_timeout
+        )
+        self._enable_debug_logging = enable_debug_logging
+        self._stats = stats
+        self._session = session
+        self._owns_session = session is None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled session, create it if needed."""
+        if self._owns_session and (self._session is None or self._session.closed):
+            connector = aiohttp.TCPConnector(
+                limit_per_host=CONNECTION_LIMIT_PER_HOST,
+                keepalive_timeout=CONNECTION_KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self) -> None:
+        """Close the pooled session if it is not shared."""
+        if not self._owns_session:
+            return
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def send(self, queries: list[Query]) -> list[dict | BaseException]:
+        """Send the commands concurrently and match the responses by id."""
+        results = await asyncio.gather(
+            *(self.request(query) for query in queries),
+            return_exceptions=True,
+        )
+        responses = {}
+        for (request_id, command), result in zip(queries, results):
+            if isinstance(result, BaseException):
+                if self._enable_debug_logging:
+                    _LOGGER.warning(
+                        "Error while getting data from %s?command=%s error: %s",
+                        self._url,
+                        command.encode(request_id),
+                        result,
+                    )
+                responses[request_id] = result
+                continue
+            responses[result.get("id", request_id)] = result
+        return [
+            responses.get(request_id, KeyError("No response with the id"))
+            for request_id, _ in queries
+        ]
+
+    def _command_url(self, request_id: int, command: Command) -> str:
+        """Url of a command with the url-encoded json as query."""
+        if command.params:
+            return f"{self._url}?command={quote(command.encode(request_id), safe='')}"
+        prefix = self._url_prefixes.get(command)
+        if prefix is None:
+            prefix = self._url_prefixes[command] = (
+                f"{self._url}?command={quote(_payload_prefix(command), safe='')}"
+            )
+        return f"{prefix}{request_id}%7D"
+
+    async def request(self, query: Query) -> dict:
+        """Excavator API Request"""
+        request_id, command = query
+        url = self._command_url(request_id, command)
+        if self._enable_debug_logging:
+            _LOGGER.info("GET %s", url)
+        session = self._get_session()
+        start = time.monotonic()
+        async with session.get(
+            url, headers=self._headers, timeout=self._timeout
+        ) as response:
+            if response.status == 200:
+                body = await response.read()
+                self._stats.record_response(
+                    command.method, (time.monotonic() - start) * 1000, len(body)
+                )
+                return orjson.loads(body)
+            if response.content:
+                raise Exception(
+                    str(response.status)
+                    + ": "
+                    + response.reason
+                    + ": "
+                    + str(await response.text())
+                )
+            raise Exception(str(response.status) + ": " + response.reason)
+
+
+class TcpTransport(ExcavatorTransport):
+    """Commands over the newline delimited JSON-RPC TCP API.
+
+    One connection is kept open and re-opened when it drops. Commands are
+    written back to back and the responses are matched to them by id.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        host_port: int,
+        enable_debug_logging: bool,
+        connect_timeout: float,
+        read_timeout: float,
+        stats: ApiStats,
+    ) -> None:
+        """Init TcpTransport."""
+        self._host = host
+        self._host_port = host_port
+        self._enable_debug_logging = enable_debug_logging
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task | None = None
+        self._stats = stats
+        # futures of the sent commands, with method and send time
+        self._pending: dict[int, tuple[asyncio.Future, str, float]] = {}
+        self._connect_lock = asyncio.Lock()
+
+    async def _connect(self) -> asyncio.StreamWriter:
+        """Open the connection if it is not open."""
+        async with self._connect_lock:
+            if self._writer is None or self._writer.is_closing():
+                if self._enable_debug_logging:
+                    _LOGGER.info("Connecting to %s:%s", self._host, self._host_port)
+                self._reader, self._writer = await asyncio.wait_for(
+                    asyncio.open_connection(
+                        self._host, self._host_port, limit=TCP_READ_LIMIT
+                    ),
+                    self._connect_timeout,
+                )
+                self._reader_task = asyncio.get_running_loop().create_task(
+                    self._read_responses(self._reader)
+                )
+            return self._writer
+
+    async def _read_responses(self, reader: asyncio.StreamReader) -> None:
+        """Resolve the pending commands with the responses read."""
+        error: Exception = ConnectionError("Connection closed by Excavator")
+        try:
+            while line := await reader.readline():
+                try:
+                    response = orjson.loads(line)
+                except ValueError as err:
+                    if self._enable_debug_logging:
+                        _LOGGER.warning("Invalid response %s: %s", line, err)
+                    continue
+                pending = self._pending.pop(response.get("id"), None)
+                if pending is None:
+                    continue
+                future, method, sent = pending
+                self._stats.record_response(
+                    method, (time.monotonic() - sent) * 1000, len(line)
+                )
+                if not future.done():
+                    future.set_result(response)
+        except (OSError, ValueError) as err:
+            # ValueError: a line longer than the limit, the stream is unusable
+            error = err
+        finally:
+            if reader is self._reader:
+                self._drop_connection(error)
+
+    def _drop_connection(self, error: Exception) -> None:
+        """Close the connection and fail the pending commands."""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+        for future, _, _ in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    async def close(self) -> None:
+        """Close the connection."""
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        self._drop_connection(ConnectionError("Connection closed"))
+
+    async def send(self, queries: list[Query]) -> list[dict | BaseException]:
+        """Write all commands at once and wait for their responses."""
+        writer = await self._connect()
+        loop = asyncio.get_running_loop()
+        futures = []
+        sent = time.monotonic()
+        for request_id, command in queries:
+            future = loop.create_future()
+            self._pending[request_id] = (future, command.method, sent)
+            futures.append(future)
+        try:
+            writer.write(
+                "".join(
+                    command.encode(request_id) + "\n" for request_id, command in queries
+                ).encode()
+            )
+            await writer.drain()
+            results = await asyncio.wait_for(
+                asyncio.gather(*futures, return_exceptions=True), self._read_timeout
+            )
+        except (OSError, asyncio.TimeoutError) as err:
+            self._drop_connection(err)
+            raise
+        finally:
+            for request_id, _ in queries:
+                self._pending.pop(request_id, None)
+        if self._enable_debug_logging:
+            for (_, command), result in zip(queries, results):
+                if isinstance(result, BaseException):
+                    _LOGGER.warning(
+                        "Error while sending %s: %s", command.method, result
+                    )
+        return results
+
 
 class ExcavatorAPI:
     """Excavator API Implementation."""
@@ -21,128 +377,230 @@ class ExcavatorAPI:
         host_port: int,
         auth_token: str = "",
         enable_debug_logging: bool = False,
+        transport: str = TRANSPORT_HTTP,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        session: aiohttp.ClientSession | None = None,
+        request_limit: asyncio.Semaphore | None = None,
     ) -> None:
-        """Init ExcavatorAPI."""
+        """Init ExcavatorAPI, session and request_limit can be shared by APIs."""
         self.host_address = self.format_host_address(host_address)
         self._host_port = host_port
         self._auth_token = auth_token
         self._enable_debug_logging = enable_debug_logging
+        self._transport_type = transport
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._session = session
+        self._request_limit = request_limit
+        self.stats = ApiStats()
+        self._transport = self._create_transport()
+        self._request_id = 0
+        self.circuit_breaker = CircuitBreaker()
 
-    def update_auth_token(self, token: str) -> None:
-        """Set new auth token."""
-        self._auth_token = token
+    def _create_transport(self) -> ExcavatorTransport:
+        """Create the transport of the configured type."""
+        if self._transport_type == TRANSPORT_TCP:
+            return TcpTransport(
+                urlsplit(self.host_address).hostname,
+                self._host_port,
+                self._enable_debug_logging,
+                self._connect_timeout,
+                self._read_timeout,
+                self.stats,
+            )
+        return HttpTransport(
+            self.host_address,
+            self._host_port,
+            self._auth_token,
+            self._enable_debug_logging,
+            self._connect_timeout,
+            self._read_timeout,
+            self.stats,
+            self._session,
+        )
 
-    async def request(self, query: str) -> ClientResponse | None:
-        """Excavator API Request"""
+    async def close(self) -> None:
+        """Close the connection."""
+        await self._transport.close()
 
-        url = f"{self.host_address}:{self._host_port}/api?command={query}"
-        if self._enable_debug_logging:
-            _LOGGER.info("GET %s", url)
-        headers = {}
-        if self._auth_token:
-            headers["Authorization"] = self._auth_token
-        async with aiohttp.ClientSession(headers=headers) as session:
-            try:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        json_data = await response.json()
-                        if json_data["error"]:
-                            raise Exception(json_data["error"])
-                        return json_data
-                    if response.content:
-                        raise Exception(
-                            str(response.status)
-                            + ": "
-                            + response.reason
-                            + ": "
-                            + str(await response.text())
-                        )
-                    raise Exception(str(response.status) + ": " + response.reason)
-            except Exception as e:
+    async def update_connection(
+        self,
+        host_address: str,
+        host_port: int,
+        auth_token: str,
+        transport: str = TRANSPORT_HTTP,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+    ) -> None:
+        """Set new connection settings, the transport is re-created if they changed."""
+        host_address = self.format_host_address(host_address)
+        if (
+            host_address == self.host_address
+            and host_port == self._host_port
+            and auth_token == self._auth_token
+            and transport == self._transport_type
+            and connect_timeout == self._connect_timeout
+            and read_timeout == self._read_timeout
+        ):
+            return
+        self.host_address = host_address
+        self._host_port = host_port
+        self._auth_token = auth_token
+        self._transport_type = transport
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        await self._transport.close()
+        self._transport = self._create_transport()
+        self.circuit_breaker = CircuitBreaker()
+
+    def _query(self, command: Command) -> Query:
+        """Pair a command with a new request id."""
+        self._request_id += 1
+        return self._request_id, command
+
+    async def command(self, command: Command) -> dict | None:
+        """Send a single command."""
+        (response,) = await self.batch([command])
+        return response
+
+    async def batch(self, commands: list[Command]) -> list[dict | None]:
+        """Send several commands, return the responses in the same order.
+
+        The commands get distinct ids, the transport matches the responses to
+        their command by id. A failed command returns None. While the circuit
+        breaker is open nothing is sent, except a single info probe when due.
+        """
+        if not self.circuit_breaker.is_closed:
+            if not self.circuit_breaker.try_probe():
+                self.stats.record_skipped(len(commands))
+                return [None] * len(commands)
+            if self._enable_debug_logging:
+                _LOGGER.info("Probing %s", self.host_address)
+            if await self._send([self._query(COMMAND_INFO)]) == [None]:
+                return [None] * len(commands)
+        queries = [self._query(command) for command in commands]
+        responses = await self._send(queries)
+        for index, response in enumerate(responses):
+            if response is None:
+                continue
+            if response.get("error"):
                 if self._enable_debug_logging:
                     _LOGGER.warning(
-                        "Error while getting data from %s error: %s", url, e
+                        "Error response to %s: %s",
+                        queries[index][1].method,
+                        response["error"],
                     )
-                return None
+                self.stats.record_failure("error_response")
+                responses[index] = None
+            else:
+                self.stats.record_success(queries[index][1].method)
+        return responses
+
+    async def _send(self, queries: list[Query]) -> list[dict | None]:
+        """Send through the transport and record the outcome in the breaker."""
+        try:
+            if self._request_limit is None:
+                results = await self._transport.send(queries)
+            else:
+                async with self._request_limit:
+                    results = await self._transport.send(queries)
+        except Exception as e:
+            if self._enable_debug_logging:
+                _LOGGER.warning(
+                    "Error while getting data from %s error: %s", self.host_address, e
+                )
+            results = [e] * len(queries)
+        responses = []
+        for result in results:
+            if isinstance(result, BaseException):
+                self.stats.record_failure(type(result).__name__)
+                result = None
+            responses.append(result)
+        if any(response is not None for response in responses):
+            self.circuit_breaker.record_success()
+        else:
+            self.circuit_breaker.record_failure()
+            if self._enable_debug_logging and not self.circuit_breaker.is_closed:
+                _LOGGER.info(
+                    "Circuit breaker of %s open after %s failures",
+                    self.host_address,
+                    self.circuit_breaker.failures,
+                )
+        return responses
 
     async def test_connection(self) -> bool:
         """Test connectivity"""
-        query = '{"id":1,"method":"info","params":[]}'
-        response = await self.request(query)
+        response = await self.command(COMMAND_INFO)
         if response is not None:
             return True
         return False
 
-    async def get_rig_info(self) -> RigInfo:
-        """Get Rig Information"""
-        query = '{"id":1,"method":"info","params":[]}'
-        response = await self.request(query)
+    async def get_rig_data(
+        self, include_inventory: bool = True
+    ) -> tuple[dict | None, list | None, list | None, list | None]:
+        """Get info, device, algorithm and worker data in one batch.
+
+        Without the inventory only the device and worker telemetry is sent,
+        info and algorithms are None.
+        """
+        commands = [COMMAND_DEVICES_GET, COMMAND_WORKER_LIST]
+        if include_inventory:
+            commands += [COMMAND_INFO, COMMAND_ALGORITHM_LIST]
+        responses = await self.batch(commands)
+        devices, workers = responses[:2]
+        info, algorithms = responses[2:] if include_inventory else (None, None)
+        return (
+            info,
+            devices.get("devices") if devices is not None else None,
+            algorithms.get("algorithms") if algorithms is not None else None,
+            workers.get("workers") if workers is not None else None,
+        )
+
+    async def get_rig_info(self) -> dict | None:
+        """Get Rig Information data"""
+        return await self.command(COMMAND_INFO)
+
+    async def get_devices(self) -> list[dict] | None:
+        """Get the device data"""
+        response = await self.command(COMMAND_DEVICES_GET)
         if response is not None:
-            return RigInfo(response)
+            return response.get("devices")
         return None
 
-    async def get_devices(self) -> dict[int, GraphicsCard]:
-        """Get the devices"""
-        query = '{"id":1,"method":"devices.get","params":[]}'
-        response = await self.request(query)
-        if response is not None:
-            devices = {}
-            for device_data in response.get("devices"):
-                card = GraphicsCard(device_data)
-                devices[card.id] = card
-            return devices
-        return {}
-
-    async def get_algorithms(self) -> dict[int, Algorithm]:
-        """Get the Algorithms"""
-        query = '{"id":1,"method":"algorithm.list","params":[]}'
-        response = await self.request(query)
+    async def get_algorithms(self) -> list[dict] | None:
+        """Get the Algorithm data"""
+        response = await self.command(COMMAND_ALGORITHM_LIST)
         if response is not None:
-            algorithms = {}
-            for algorithm_data in response.get("algorithms"):
-                algorithm = Algorithm(algorithm_data)
-                algorithms[algorithm.id] = algorithm
-            return algorithms
-        return {}
-
-    async def get_workers(self) -> dict[int, Worker]:
-        """Get the workers"""
-        query = '{"id":1,"method":"worker.list","params":[]}'
-        response = await self.request(query)
+            return response.get("algorithms")
+        return None
+
+    async def get_workers(self) -> list[dict] | None:
+        """Get the worker data"""
+        response = await self.command(COMMAND_WORKER_LIST)
         if response is not None:
-            workers = {}
-            for worker_data in response.get("workers"):
-                worker = Worker(worker_data)
-                workers[worker.id] = worker
-            return workers
-        return {}
+            return response.get("workers")
+        return None
 
     async def device_add_algorithm(self, device_id: int, algorithm: str) -> bool:
         """Add algorithm to a worker"""
-        query = (
-            '{"id":1,"method":"worker.add","params":["'
-            + algorithm
-            + '","'
-            + str(device_id)
-            + '"]}'
+        response = await self.command(
+            Command(METHOD_WORKER_ADD, (algorithm, str(device_id)))
         )
-        response = await self.request(query)
         if response is not None:
             return True
         return False
 
     async def add_algorithm(self, algorithm: str) -> bool:
         """Add algorithm to a rig"""
-        query = '{"id":1,"method":"algorithm.add","params":["' + algorithm + '"]}'
-        response = await self.request(query)
+        response = await self.command(Command(METHOD_ALGORITHM_ADD, (algorithm,)))
         if response is not None:
             return True
         return False
 
     async def worker_free(self, worker_id: int) -> bool:
         """free up worker"""
-        query = '{"id":1,"method":"worker.free","params":["' + str(worker_id) + '"]}'
-        response = await self.request(query)
+        response = await self.command(Command(METHOD_WORKER_FREE, (str(worker_id),)))
         if response is not None:
             return True
         return False
@@ -0,0 +1,114 @@
+"""Recent samples and rolling statistics of the rig data."""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+
+
+class RingBuffer:
+    """Fixed size buffer of the latest samples with rolling statistics.
+
+    Mean, min, max and EMA are updated on every append in O(1), min and max
+    amortized via monotonic queues of the sample positions.
+    """
+
+    __slots__ = (
+        "_alpha",
+        "_count",
+        "_ema",
+        "_max_queue",
+        "_min_queue",
+        "_samples",
+        "_size",
+        "_sum",
+    )
+
+    def __init__(self, size: int, alpha: float) -> None:
+        """Init RingBuffer."""
+        self._size = size
+        self._alpha = alpha
+        self._samples = array("d", bytes(8 * size))
+        self._count = 0
+        self._sum = 0.0
+        self._ema: float | None = None
+        # (position, value) with increasing values for min, decreasing for max
+        self._min_queue: deque[tuple[int, float]] = deque()
+        self._max_queue: deque[tuple[int, float]] = deque()
+
+    def __len__(self) -> int:
+        return min(self._count, self._size)
+
+    def append(self, value: float) -> None:
+        """Add a sample, the oldest one drops out when the buffer is full."""
+        index = self._count % self._size
+        if self._count >= self._size:
+            self._sum -= self._samples[index]
+        self._samples[index] = value
+        self._sum += value
+        self._count += 1
+        if index == self._size - 1:
+            # reset the floating point drift of the running sum once per round
+            self._sum = sum(self._samples)
+
+        oldest = self._count - self._size
+        min_queue = self._min_queue
+        while min_queue and min_queue[-1][1] >= value:
+            min_queue.pop()
+        min_queue.append((self._count, value))
+        if min_queue[0][0] <= oldest:
+            min_queue.popleft()
+        max_queue = self._max_queue
+        while max_queue and max_queue[-1][1] <= value:
+            max_queue.pop()
+        max_queue.append((self._count, value))
+        if max_queue[0][0] <= oldest:
+            max_queue.popleft()
+
+        if self._ema is None:
+            self._ema = value
+        else:
+            self._ema += self._alpha * (value - self._ema)
+
+    @property
+    def latest(self) -> float | None:
+        """Latest sample, None if empty."""
+        if not self._count:
+            return None
+        return self._samples[(self._count - 1) % self._size]
+
+    @property
+    def mean(self) -> float | None:
+        """Mean of the samples, None if empty."""
+        if not self._count:
+            return None
+        return self._sum / len(self)
+
+    @property
+    def min(self) -> float | None:
+        """Minimum of the samples, None if empty."""
+        return self._min_queue[0][1] if self._min_queue else None
+
+    @property
+    def max(self) -> float | None:
+        """Maximum of the samples, None if empty."""
+        return self._max_queue[0][1] if self._max_queue else None
+
+    @property
+    def ema(self) -> float | None:
+        """Exponential moving average of all samples, None if empty."""
+        return self._ema
+
+    def values(self) -> list[float]:
+        """Samples from the oldest to the latest."""
+        if self._count <= self._size:
+            return self._samples[: self._count].tolist()
+        index = self._count % self._size
+        return (self._samples[index:] + self._samples[:index]).tolist()
+
+    def summary(self, digits: int = 2) -> tuple:
+        """Rounded mean, min, max and EMA, to detect visible changes."""
+        return tuple(
+            None if value is None else round(value, digits)
+            for value in (self.mean, self.min, self.max, self.ema)
+        )
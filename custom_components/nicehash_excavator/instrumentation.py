@@ -0,0 +1,99 @@
+"""Counters and histograms of the polling, built to dicts only when queried."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+
+# upper bounds of the histogram buckets
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+SIZE_BUCKETS_BYTES = (256, 1024, 4096, 16384, 65536, 262144)
+FANOUT_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100)
+
+
+class Histogram:
+    """Count of values per bucket, with count, sum and max."""
+
+    __slots__ = ("_bounds", "buckets", "count", "max", "total")
+
+    def __init__(self, bounds: tuple) -> None:
+        """Init Histogram, the last bucket counts the values above the bounds."""
+        self._bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        """Add a value."""
+        self.buckets[bisect_left(self._bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def as_dict(self) -> dict:
+        """Summary and the buckets by upper bound."""
+        buckets = {
+            f"<={bound}": count for bound, count in zip(self._bounds, self.buckets)
+        }
+        buckets[f">{self._bounds[-1]}"] = self.buckets[-1]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "max": round(self.max, 3),
+            "buckets": buckets,
+        }
+
+
+class ApiStats:
+    """Latency, response size and outcome of the commands sent to Excavator."""
+
+    def __init__(self) -> None:
+        """Init ApiStats."""
+        self.latency: dict[str, Histogram] = {}
+        self.response_bytes: dict[str, Histogram] = {}
+        self.successes: dict[str, int] = {}
+        # by error type, e.g. TimeoutError or error_response
+        self.failures: dict[str, int] = {}
+        self.failure_count = 0
+        # not sent while the circuit breaker is open, kept out of the failures
+        # so an offline rig does not change them every poll
+        self.skipped_count = 0
+
+    def record_response(self, method: str, latency_ms: float, size: int) -> None:
+        """Add a received response."""
+        histogram = self.latency.get(method)
+        if histogram is None:
+            histogram = self.latency[method] = Histogram(LATENCY_BUCKETS_MS)
+            self.response_bytes[method] = Histogram(SIZE_BUCKETS_BYTES)
+        histogram.record(latency_ms)
+        self.response_bytes[method].record(size)
+
+    def record_success(self, method: str) -> None:
+        """Add a command answered without error."""
+        self.successes[method] = self.successes.get(method, 0) + 1
+
+    def record_failure(self, error_type: str) -> None:
+        """Add a failed command."""
+        self.failures[error_type] = self.failures.get(error_type, 0) + 1
+        self.failure_count += 1
+
+    def record_skipped(self, count: int) -> None:
+        """Add commands not sent because the circuit breaker is open."""
+        self.skipped_count += count
+
+    def as_dict(self) -> dict:
+        """All counters and histograms."""
+        return {
+            "successes": dict(self.successes),
+            "failures": dict(self.failures),
+            "skipped": self.skipped_count,
+            "latency_ms": {
+                method: histogram.as_dict()
+                for method, histogram in self.latency.items()
+            },
+            "response_bytes": {
+                method: histogram.as_dict()
+                for method, histogram in self.response_bytes.items()
+            },
+        }
@@ -2,30 +2,195 @@
 
 from __future__ import annotations
 
-import datetime
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Hashable, Iterable
+from dataclasses import dataclass, field
 
-import homeassistant
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import Callable, HomeAssistant
+from homeassistant.core import Callable, HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.storage import Store
 
 from .const import (
+    ADAPTIVE_HASHRATE_DELTA,
+    ADAPTIVE_HOT_TEMPERATURE,
+    ADAPTIVE_TEMPERATURE_DELTA,
+    ALGORITHM_NONE,
     CONFIG_ENABLE_DEBUG_LOGGING,
+    CONFIG_GOVERNOR,
+    CONFIG_GOVERNOR_HOTSPOT_TEMPERATURE,
+    CONFIG_GOVERNOR_HYSTERESIS,
+    CONFIG_GOVERNOR_TEMPERATURE,
     CONFIG_HOST_ADDRESS,
     CONFIG_HOST_PORT,
+    CONFIG_IDLE_TIMEOUT,
+    CONFIG_MAX_PUBLISH_AGE,
+    CONFIG_MIN_PUBLISH_INTERVAL,
     CONFIG_NAME,
     CONFIG_UPDATE_INTERVAL,
+    CONFIG_UPDATE_INTERVAL_FAST,
+    CONFIG_UPDATE_MODE,
     CONFIG_AUTH_TOKEN,
+    CONFIG_CONNECT_TIMEOUT,
+    CONFIG_READ_TIMEOUT,
+    CONFIG_TRANSPORT,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEADBANDS,
+    DEFAULT_GOVERNOR_HOTSPOT_TEMPERATURE,
+    DEFAULT_GOVERNOR_HYSTERESIS,
+    DEFAULT_GOVERNOR_TEMPERATURE,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_MAX_PUBLISH_AGE,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_UPDATE_INTERVAL,
+    DEFAULT_UPDATE_INTERVAL_FAST,
+    DOMAIN,
+    HISTORY_EMA_ALPHA,
+    HISTORY_SIZE,
+    TRANSPORT_HTTP,
+    UPDATE_MODE_ADAPTIVE,
+    UPDATE_MODE_SLOW,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
 )
-from .data_containers import Algorithm, GraphicsCard, Worker
+from .data_containers import Algorithm, GraphicsCard, RigInfo, Worker, update_items
 from .excavator import ExcavatorAPI
+from .history import RingBuffer
+from .instrumentation import (
+    FANOUT_BUCKETS_MS,
+    LATENCY_BUCKETS_MS,
+    ApiStats,
+    Histogram,
+)
+from .scheduler import PollScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+# keys entities register their callbacks for, see MiningRig.register_callback
+UPDATE_KEY_POLL = "poll"
+UPDATE_KEY_STATUS = "status"
+UPDATE_KEY_INFO = "info"
+UPDATE_KEY_DEVICES = "devices"
+UPDATE_KEY_GPU_MODELS = "gpu_models"
+UPDATE_KEY_ALGORITHMS = "algorithms"
+UPDATE_KEY_WORKERS = "workers"
+# (UPDATE_KEY_DEVICE, device id, attribute) when that attribute changed
+UPDATE_KEY_DEVICE = "device"
+UPDATE_KEY_ALGORITHM = "algorithm"
+UPDATE_KEY_ALGORITHM_SPEED = "algorithm_speed"
+UPDATE_KEY_ALGORITHM_NAMES = "algorithm_names"
+UPDATE_KEY_WORKER = "worker"
+UPDATE_KEY_WORKER_ALGORITHM = "worker_algorithm"
+UPDATE_KEY_MODE = "update_mode"
+UPDATE_KEY_HISTORY = "history"
+UPDATE_KEY_EFFICIENCY = "efficiency"
+UPDATE_KEY_STATS = "stats"
+# published after the fan-out of the poll, with its time
+UPDATE_KEY_FANOUT = "fanout"
+
+# device values kept in the history
+HISTORY_DEVICE_FIELDS = ("gpu_temp", "gpu_power_usage", "gpu_fan_speed")
+
+
+def _add_update_keys(update_keys: set, key: str, many_key: str, ids: set) -> None:
+    """Add the keys of the changed ids."""
+    if ids:
+        update_keys.add(many_key)
+        update_keys.update((key, item_id) for item_id in ids)
+
+
+@dataclass(slots=True)
+class PublishThrottle:
+    """Limits for writing the states of high frequency sensors."""
+
+    min_interval: float = 0
+    max_age: float = DEFAULT_MAX_PUBLISH_AGE
+    deadbands: dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls, data: dict) -> PublishThrottle:
+        """Create PublishThrottle from config entry data."""
+        return cls(
+            data.get(CONFIG_MIN_PUBLISH_INTERVAL, 0),
+            data.get(CONFIG_MAX_PUBLISH_AGE, DEFAULT_MAX_PUBLISH_AGE),
+            {key: data.get(key, 0) for key in DEADBANDS},
+        )
+
+
+@dataclass(slots=True)
+class ThermalGovernor:
+    """Temperatures at which the governor stops and resumes the GPUs."""
+
+    enabled: bool = False
+    temperature: float = DEFAULT_GOVERNOR_TEMPERATURE
+    hotspot_temperature: float = DEFAULT_GOVERNOR_HOTSPOT_TEMPERATURE
+    hysteresis: float = DEFAULT_GOVERNOR_HYSTERESIS
+
+    @classmethod
+    def from_config(cls, data: dict) -> ThermalGovernor:
+        """Create ThermalGovernor from config entry data."""
+        return cls(
+            data.get(CONFIG_GOVERNOR, False),
+            data.get(CONFIG_GOVERNOR_TEMPERATURE, DEFAULT_GOVERNOR_TEMPERATURE),
+            data.get(
+                CONFIG_GOVERNOR_HOTSPOT_TEMPERATURE,
+                DEFAULT_GOVERNOR_HOTSPOT_TEMPERATURE,
+            ),
+            data.get(CONFIG_GOVERNOR_HYSTERESIS, DEFAULT_GOVERNOR_HYSTERESIS),
+        )
+
+    def is_hot(self, device: GraphicsCard) -> bool:
+        """Whether a GPU reached a stop temperature or is too hot for Excavator."""
+        return bool(
+            device.too_hot
+            or (device.gpu_temp is not None and device.gpu_temp >= self.temperature)
+            or (
+                device.hotspot_temp is not None
+                and device.hotspot_temp >= self.hotspot_temperature
+            )
+        )
+
+    def is_cool(self, device: GraphicsCard) -> bool:
+        """Whether a GPU cooled below the stop temperatures by the hysteresis."""
+        return (
+            not device.too_hot
+            and device.gpu_temp is not None
+            and device.gpu_temp <= self.temperature - self.hysteresis
+            and (
+                device.hotspot_temp is None
+                or device.hotspot_temp <= self.hotspot_temperature - self.hysteresis
+            )
+        )
+
+
+def _append_sample(buffer: RingBuffer, value: float | None) -> bool:
+    """Append a sample if there is one, return True if the statistics changed."""
+    if value is None:
+        return False
+    summary = buffer.summary()
+    buffer.append(value)
+    return buffer.summary() != summary
 
 
 class MiningRig:
     """The Rig containing devices"""
 
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        scheduler: PollScheduler,
+    ) -> None:
         """Init MiningRig."""
         self._hass = hass
+        # last known inventory, entities are created from it before the first poll
+        self._store: Store[dict] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}"
+        )
+        self._scheduler = scheduler
         self._name = config_entry.data[CONFIG_NAME]
         self._id = config_entry.data[CONFIG_NAME].lower()
         try:
@@ -37,67 +202,803 @@ class MiningRig:
             config_entry.data[CONFIG_HOST_PORT],
             config_entry.data[CONFIG_AUTH_TOKEN],
             self._enable_debug_logging,
+            config_entry.data.get(CONFIG_TRANSPORT, TRANSPORT_HTTP),
+            config_entry.data.get(CONFIG_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT),
+            config_entry.data.get(CONFIG_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+            scheduler.session,
+            scheduler.request_limit,
         )
-        self.algorithms = {}
-        self.devices = {}
-        self.workers = {}
-        self.online = True
-        self.info = None
+        self.algorithms: dict[int, Algorithm] = {}
+        # incremented when the algorithms change, to invalidate derived data
+        self.algorithms_version = 0
+        self.devices: dict[int, GraphicsCard] = {}
+        self.workers: dict[int, Worker] = {}
+        self.online = False
+        self.info: RigInfo | None = None
+        self._device_workers: dict[str, Worker] = {}
+        self._worker_speeds: dict[tuple[str, int], float] = {}
+        # speed of the algorithms summed over the workers of the last poll
+        self._algorithm_speeds: dict[int, float] = {}
+        self._algorithm_ids: dict[str, int] = {}
+        # (device uuid, algorithm id) pairs seen in worker.list, last seen time
+        self.worker_algorithms: dict[tuple[str, int], float] = {}
+        self._idle_timeout = (
+            config_entry.data.get(CONFIG_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT) * 60
+        )
+        self._device_models: tuple = ()
+        self.gpu_count = 0
+        self.gpu_models = ""
+        self.gpu_model_list = ""
+        self.total_power: float = 0
+        self.poll_latency: float | None = None
+        self.poll_latency_histogram = Histogram(LATENCY_BUCKETS_MS)
+        # time to call the entity callbacks of a poll
+        self.fanout_time: float | None = None
+        self.fanout_histogram = Histogram(FANOUT_BUCKETS_MS)
+        # Mh/s per W of the devices, J per Mh of the rig
+        self.device_efficiency: dict[int, float | None] = {}
+        self.rig_efficiency: float | None = None
+        self._device_history: dict[int, dict[str, RingBuffer]] = {}
+        self._speed_history: dict[tuple[str, int], RingBuffer] = {}
+
+        self.publish_throttle = PublishThrottle.from_config(config_entry.data)
+        self.thermal_governor = ThermalGovernor.from_config(config_entry.data)
+        # algorithm of the GPUs stopped by the governor, by device uuid
+        self.governor_stopped: dict[str, str] = {}
 
-        self._callbacks = set()
+        self._listeners: dict[Hashable, set[Callable[[], None]]] = {}
+        self._entity_removers: dict[Hashable, set[Callable[[], Awaitable]]] = {}
+        self._entity_factories: list[
+            tuple[AddEntitiesCallback, Callable[[set, set], list[Entity]]]
+        ] = []
 
-        self._remove_update_listener = None
-        update_interval = config_entry.data.get(CONFIG_UPDATE_INTERVAL)
-        self.set_update_interval(hass, update_interval)
+        self._update_lock = asyncio.Lock()
+        self._update_task: asyncio.Task | None = None
+        self.skipped_polls = 0
+        self._published_stats = (0, 0)
+        # info and algorithm.list are refreshed at the slow interval or when stale
+        self._inventory_refreshed: float | None = None
+        self._inventory_stale = True
+
+        self._update_interval = 0
+        self._slow_interval = config_entry.data.get(
+            CONFIG_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
+        )
+        self._fast_interval = config_entry.data.get(
+            CONFIG_UPDATE_INTERVAL_FAST, DEFAULT_UPDATE_INTERVAL_FAST
+        )
+        self.update_mode = UPDATE_MODE_SLOW
+        self.set_update_mode(
+            config_entry.data.get(CONFIG_UPDATE_MODE, UPDATE_MODE_SLOW)
+        )
+
+    @property
+    def api_stats(self) -> ApiStats:
+        """Counters of the commands sent to Excavator."""
+        return self._api.stats
+
+    def diagnostics(self) -> dict:
+        """State and counters of the rig for the diagnostics."""
+        return {
+            "online": self.online,
+            "update_mode": self.update_mode,
+            "update_interval": self._update_interval,
+            "circuit_breaker": self.circuit_breaker_state,
+            "consecutive_failures": self.consecutive_failures,
+            "skipped_polls": self.skipped_polls,
+            "devices": len(self.devices),
+            "algorithms": len(self.algorithms),
+            "workers": len(self.workers),
+            "governor_stopped": dict(self.governor_stopped),
+            "listeners": sum(len(listeners) for listeners in self._listeners.values()),
+            "poll_latency_ms": self.poll_latency_histogram.as_dict(),
+            "fanout_ms": self.fanout_histogram.as_dict(),
+            "api": self._api.stats.as_dict(),
+        }
+
+    @property
+    def update_interval(self) -> float:
+        """Current update interval in seconds."""
+        return self._update_interval
+
+    @property
+    def name(self) -> str:
+        """Name of the MiningRig."""
+        return self._name
 
     @property
     def mining_rig_id(self) -> str:
         """ID for MiningRig."""
         return self._id
 
+    @property
+    def circuit_breaker_state(self) -> str:
+        """State of the circuit breaker of the connection."""
+        return self._api.circuit_breaker.state
+
+    @property
+    def consecutive_failures(self) -> int:
+        """Number of consecutive failed requests."""
+        return self._api.circuit_breaker.failures
+
     async def test_connection(self) -> bool:
         """Test connectivity to the MiningRig."""
         self.online = await self._api.test_connection()
         return self.online
 
-    def register_callback(self, callback: Callable[[], None]) -> None:
-        """Register callback, called when MiningRig updates."""
-        self._callbacks.add(callback)
+    def register_callback(
+        self, callback: Callable[[], None], update_keys: Iterable[Hashable]
+    ) -> None:
+        """Register callback, called when data of one of the keys changes."""
+        for key in update_keys:
+            self._listeners.setdefault(key, set()).add(callback)
 
     def remove_callback(self, callback: Callable[[], None]) -> None:
         """Remove previously registered callback."""
-        self._callbacks.discard(callback)
+        for key in list(self._listeners):
+            self._listeners[key].discard(callback)
+            if not self._listeners[key]:
+                del self._listeners[key]
+
+    def register_entity_removal(
+        self, async_retire: Callable[[], Awaitable], item_keys: Iterable[Hashable]
+    ) -> None:
+        """Register the removal of an entity, called when one of the items is gone."""
+        for key in item_keys:
+            self._entity_removers.setdefault(key, set()).add(async_retire)
+
+    def remove_entity_removal(self, async_retire: Callable[[], Awaitable]) -> None:
+        """Remove previously registered entity removal."""
+        for key in list(self._entity_removers):
+            self._entity_removers[key].discard(async_retire)
+            if not self._entity_removers[key]:
+                del self._entity_removers[key]
+
+    @callback
+    def register_entity_factory(
+        self,
+        async_add_entities: AddEntitiesCallback,
+        create_entities: Callable[[set, set], list[Entity]],
+    ) -> None:
+        """Add the entities of the current and of later added devices and algorithms.
+
+        create_entities gets the new device ids, algorithm ids and
+        (device uuid, algorithm id) pairs of the workers.
+        """
+        self._entity_factories.append((async_add_entities, create_entities))
+        entities = create_entities(
+            set(self.devices), set(self.algorithms), set(self.worker_algorithms)
+        )
+        if entities:
+            async_add_entities(entities)
+
+    def _device_uuids(self) -> dict[int, str | None]:
+        """UUID of the GPU at each device id."""
+        return {device_id: device.uuid for device_id, device in self.devices.items()}
+
+    def _algorithm_names(self) -> dict[int, str | None]:
+        """Name of the algorithm at each algorithm id."""
+        return {
+            algorithm_id: algorithm.name
+            for algorithm_id, algorithm in self.algorithms.items()
+        }
+
+    @callback
+    def _async_update_entities(
+        self, old_devices: dict[int, str | None], old_algorithm_ids: set
+    ) -> None:
+        """Add and remove the entities of added and removed items.
+
+        A different GPU at the id of a known one is removed and added again,
+        its entities are bound to the UUID.
+        """
+        removed_devices = {
+            device_id
+            for device_id, uuid in old_devices.items()
+            if device_id not in self.devices or self.devices[device_id].uuid != uuid
+        }
+        added_devices = (self.devices.keys() - old_devices.keys()) | (
+            removed_devices & self.devices.keys()
+        )
+        removed_algorithms = old_algorithm_ids - self.algorithms.keys()
+        added_algorithms = self.algorithms.keys() - old_algorithm_ids
+        added_pairs, idle_pairs = self._update_worker_algorithms()
+        if (
+            added_devices
+            or added_algorithms
+            or added_pairs
+            or idle_pairs
+            or removed_devices
+            or removed_algorithms
+        ):
+            self._async_save_inventory()
+
+        # removed first, the entities of a replaced GPU use the same keys
+        removed_keys = (
+            [(UPDATE_KEY_DEVICE, device_id) for device_id in removed_devices]
+            + [
+                (UPDATE_KEY_ALGORITHM, algorithm_id)
+                for algorithm_id in removed_algorithms
+            ]
+            + [(UPDATE_KEY_WORKER_ALGORITHM, *pair) for pair in idle_pairs]
+        )
+        removers = set()
+        for key in removed_keys:
+            removers.update(self._entity_removers.pop(key, ()))
+        for async_retire in removers:
+            # an entity can depend on a removed device and a removed algorithm
+            self.remove_entity_removal(async_retire)
+            self._hass.async_create_task(async_retire())
+
+        if added_devices or added_algorithms or added_pairs:
+            for async_add_entities, create_entities in self._entity_factories:
+                entities = create_entities(added_devices, added_algorithms, added_pairs)
+                if entities:
+                    async_add_entities(entities)
+
+    def _update_worker_algorithms(self) -> tuple[set, set]:
+        """Track the pairs the workers run, return the new and the idle pairs."""
+        now = time.monotonic()
+        device_uuids = {device.uuid for device in self.devices.values()}
+        added_pairs = set()
+        for pair in self._worker_speeds:
+            # only pairs the entities can be created for
+            if pair[0] not in device_uuids or pair[1] not in self.algorithms:
+                continue
+            if pair not in self.worker_algorithms:
+                added_pairs.add(pair)
+            self.worker_algorithms[pair] = now
+
+        idle_pairs = set()
+        for pair, last_seen in list(self.worker_algorithms.items()):
+            if pair[0] not in device_uuids or pair[1] not in self.algorithms:
+                # entity is removed with its device or algorithm
+                del self.worker_algorithms[pair]
+            elif self._idle_timeout and now - last_seen > self._idle_timeout:
+                if self._enable_debug_logging:
+                    _LOGGER.info("Remove idle hashrate sensor %s", pair)
+                del self.worker_algorithms[pair]
+                idle_pairs.add(pair)
+        return added_pairs, idle_pairs
+
+    async def async_load(self) -> None:
+        """Restore the last known inventory, the rig stays offline until polled."""
+        data = await self._store.async_load()
+        if not data:
+            return
+        update_items(self.devices, data.get("devices"), GraphicsCard)
+        update_items(self.algorithms, data.get("algorithms"), Algorithm)
+        self.algorithms_version += 1
+        update_items(self.workers, data.get("workers"), Worker)
+        if data.get("info") is not None:
+            self.info = RigInfo.from_data(data["info"])
+        self._update_device_summary()
+        self._build_indexes()
+        self._update_algorithm_speeds(set())
+        self._update_worker_algorithms()
+        self._restore_governor_stopped(data.get("governor_stopped") or {})
+
+    def _restore_governor_stopped(self, stopped: dict[str, str]) -> None:
+        """Resume the GPUs the governor stopped before a restart once cooled."""
+        device_uuids = {device.uuid for device in self.devices.values()}
+        stopped = {uuid: a for uuid, a in stopped.items() if uuid in device_uuids}
+        if not stopped:
+            return
+        if self.thermal_governor.enabled:
+            self.governor_stopped.update(stopped)
+            _LOGGER.warning(
+                "%s GPUs %s stopped by the governor are resumed once cooled",
+                self._name,
+                ", ".join(stopped),
+            )
+        else:
+            # not tracked anymore, the next save drops them
+            _LOGGER.warning(
+                "%s GPUs %s stopped by the governor are not resumed, "
+                "the governor is disabled",
+                self._name,
+                ", ".join(stopped),
+            )
+
+    @callback
+    def _async_save_inventory(self) -> None:
+        """Save the inventory after a delay, changes in between are saved once."""
+        self._store.async_delay_save(self._inventory_data, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _inventory_data(self) -> dict:
+        """The inventory in the format of the API data."""
+        return {
+            "info": self.info.as_data() if self.info is not None else None,
+            "devices": [device.as_data() for device in self.devices.values()],
+            "algorithms": [
+                algorithm.as_data() for algorithm in self.algorithms.values()
+            ],
+            "workers": [worker.as_data() for worker in self.workers.values()],
+            "governor_stopped": dict(self.governor_stopped),
+        }
 
     async def update(self, event=None) -> None:
         """Update MiningRig via Excavator API."""
-        self.algorithms = await self._api.get_algorithms()
-        self.devices = await self._api.get_devices()
-        self.workers = await self._api.get_workers()
-        self.info = await self._api.get_rig_info()
-        if self.info is None:
-            self.online = False
+        async with self._update_lock:
+            await self._async_poll()
+
+    @callback
+    def async_scheduled_update(self) -> None:
+        """Start a scheduled update unless one is in flight."""
+        if self._update_task is not None and not self._update_task.done():
+            self.skipped_polls += 1
+            return
+        self._update_task = self._hass.async_create_background_task(
+            self.update(), f"{self._name} Excavator update"
+        )
+
+    async def _async_poll(self) -> None:
+        """Poll all commands and publish the result."""
+        start = time.monotonic()
+        status = (self.circuit_breaker_state, self.consecutive_failures)
+        old_devices = self._device_uuids()
+        old_algorithm_ids = set(self.algorithms)
+        old_online = self.online
+        old_temperatures = self._temperatures()
+        old_speeds = self._worker_speeds
+        refresh_inventory = (
+            self._inventory_stale
+            or start - self._inventory_refreshed >= self._slow_interval
+        )
+        info, devices, algorithms, workers = await self._api.get_rig_data(
+            refresh_inventory
+        )
+        self.poll_latency = round((time.monotonic() - start) * 1000, 1)
+        self.poll_latency_histogram.record(self.poll_latency)
+
+        # a command that failed (None) keeps its previous data
+        update_keys = {UPDATE_KEY_POLL}
+        stats = (self._api.stats.failure_count, self.skipped_polls)
+        if stats != self._published_stats:
+            self._published_stats = stats
+            update_keys.add(UPDATE_KEY_STATS)
+        if (self.circuit_breaker_state, self.consecutive_failures) != status:
+            update_keys.add(UPDATE_KEY_STATUS)
+        if algorithms is not None:
+            old_names = self._algorithm_names()
+            changed = update_items(self.algorithms, algorithms, Algorithm)
+            # speed changes don't touch the options of the selectors
+            if changed and self._algorithm_names() != old_names:
+                self.algorithms_version += 1
+                update_keys.add(UPDATE_KEY_ALGORITHM_NAMES)
+            _add_update_keys(
+                update_keys, UPDATE_KEY_ALGORITHM, UPDATE_KEY_ALGORITHMS, changed
+            )
+        if devices is not None:
+            device_fields: dict[int, list[str]] = {}
+            changed = update_items(self.devices, devices, GraphicsCard, device_fields)
+            if changed:
+                if self._update_device_summary():
+                    update_keys.add(UPDATE_KEY_GPU_MODELS)
+                for device_id, uuid in old_devices.items():
+                    if (
+                        device_id in self.devices
+                        and self.devices[device_id].uuid != uuid
+                    ):
+                        # another GPU at the id, its history starts over
+                        self._device_history.pop(device_id, None)
+            _add_update_keys(
+                update_keys, UPDATE_KEY_DEVICE, UPDATE_KEY_DEVICES, changed
+            )
+            # added and removed devices create and remove their entities
+            for device_id, fields in device_fields.items():
+                update_keys.update(
+                    (UPDATE_KEY_DEVICE, device_id, field) for field in fields
+                )
+        if refresh_inventory and info is not None and algorithms is not None:
+            self._inventory_refreshed = start
+            self._inventory_stale = False
+        if workers is not None:
+            self._update_workers(workers, update_keys)
+
+        if info is not None:
+            if self.info is None:
+                self.info = RigInfo.from_data(info)
+                update_keys.add(UPDATE_KEY_INFO)
+            elif self.info.update_from(info):
+                update_keys.add(UPDATE_KEY_INFO)
+        self.online = any(
+            response is not None for response in (info, devices, algorithms, workers)
+        )
+        if not self.online:
+            self._inventory_stale = True
+        self._build_indexes()
+        if (
+            devices is not None
+            and self.thermal_governor.enabled
+            and await self._async_govern()
+        ):
+            # publish the stopped and resumed workers with this poll
+            governed_workers = await self._api.get_workers()
+            if governed_workers is not None:
+                self._update_workers(governed_workers, update_keys)
+                self._build_indexes()
+        self._update_algorithm_speeds(update_keys)
+        self._record_history(update_keys, devices is not None, workers is not None)
+        self._update_efficiency(update_keys)
+
+        fanout_start = time.monotonic()
+        if self.online != old_online:
+            await self.publish_updates()
+        else:
+            await self.publish_updates(update_keys)
+        self.fanout_time = round((time.monotonic() - fanout_start) * 1000, 3)
+        self.fanout_histogram.record(self.fanout_time)
+        self._async_publish({UPDATE_KEY_FANOUT})
+        self._async_update_entities(old_devices, old_algorithm_ids)
+
+        if self.update_mode == UPDATE_MODE_ADAPTIVE:
+            self._adapt_update_interval(
+                self.online != old_online
+                or self._is_changing(old_temperatures, old_speeds)
+                or self._is_hot()
+            )
+
+    async def _async_govern(self) -> bool:
+        """Stop the hot GPUs and resume the cooled ones, True if one changed."""
+        commands = []
+        for device in self.devices.values():
+            worker = self._device_workers.get(device.uuid)
+            if self.thermal_governor.is_hot(device):
+                if worker is not None and worker.algorithms:
+                    commands.append(self._async_stop_device(device, worker))
+            elif device.uuid in self.governor_stopped and (
+                self.thermal_governor.is_cool(device)
+            ):
+                commands.append(self._async_resume_device(device, worker))
+        if not commands:
+            return False
+        old_stopped = dict(self.governor_stopped)
+        await asyncio.gather(*commands)
+        if self.governor_stopped != old_stopped:
+            # resumed after a restart too
+            self._async_save_inventory()
+        return True
+
+    async def _async_stop_device(self, device: GraphicsCard, worker: Worker) -> None:
+        """Free the worker of a hot GPU and remember its algorithm."""
+        algorithm = next(iter(worker.algorithms.values())).name
+        if await self._api.worker_free(worker.id):
+            self.governor_stopped[device.uuid] = algorithm
+            _LOGGER.warning(
+                "%s GPU %s at %s °C, hotspot %s °C: stopped %s",
+                self._name,
+                device.id,
+                device.gpu_temp,
+                device.hotspot_temp,
+                algorithm,
+            )
+        else:
+            _LOGGER.error(
+                "%s GPU %s at %s °C, hotspot %s °C: failed to stop %s",
+                self._name,
+                device.id,
+                device.gpu_temp,
+                device.hotspot_temp,
+                algorithm,
+            )
+
+    async def _async_resume_device(
+        self, device: GraphicsCard, worker: Worker | None
+    ) -> None:
+        """Add the algorithm again to a GPU that cooled down."""
+        algorithm = self.governor_stopped.pop(device.uuid)
+        if worker is not None:
+            _LOGGER.info(
+                "%s GPU %s was started again, %s is not resumed",
+                self._name,
+                device.id,
+                algorithm,
+            )
+        elif await self._api.device_add_algorithm(device.uuid, algorithm):
+            _LOGGER.info(
+                "%s GPU %s cooled to %s °C, hotspot %s °C: resumed %s",
+                self._name,
+                device.id,
+                device.gpu_temp,
+                device.hotspot_temp,
+                algorithm,
+            )
+        else:
+            # retried with the next poll
+            self.governor_stopped[device.uuid] = algorithm
+            _LOGGER.error(
+                "%s GPU %s: failed to resume %s", self._name, device.id, algorithm
+            )
+
+    async def update_workers(self) -> None:
+        """Update only the workers, to confirm a worker command quickly."""
+        async with self._update_lock:
+            workers = await self._api.get_workers()
+            if workers is None:
+                return
+            update_keys = set()
+            self._update_workers(workers, update_keys)
+            self._build_indexes()
+            self._update_algorithm_speeds(update_keys)
+            self._update_efficiency(update_keys)
+            await self.publish_updates(update_keys)
+            self._async_update_entities(self._device_uuids(), set(self.algorithms))
+
+    def _update_workers(self, workers: list[dict], update_keys: set) -> None:
+        """Update the workers from worker.list, add the keys of changed workers."""
+        # worker entities are keyed by device uuid
+        uuids = {worker.id: worker.device_uuid for worker in self.workers.values()}
+        changed = update_items(self.workers, workers, Worker)
+        if self.workers.keys() != uuids.keys() or any(
+            algorithm_id not in self.algorithms
+            for worker in self.workers.values()
+            for algorithm_id in worker.algorithms
+        ):
+            # started or stopped workers may have changed the algorithms
+            self._inventory_stale = True
+        uuids.update(
+            (worker_id, self.workers[worker_id].device_uuid)
+            for worker_id in changed
+            if worker_id in self.workers
+        )
+        _add_update_keys(
+            update_keys,
+            UPDATE_KEY_WORKER,
+            UPDATE_KEY_WORKERS,
+            {uuids[worker_id] for worker_id in changed},
+        )
+
+    def _update_device_summary(self) -> bool:
+        """Aggregate the devices, True if the models of the device set changed."""
+        self.total_power = sum(
+            device.gpu_power_usage
+            for device in self.devices.values()
+            if device.gpu_power_usage is not None
+        )
+        device_models = tuple(
+            (device_id, device.name) for device_id, device in self.devices.items()
+        )
+        if device_models == self._device_models:
+            return False
+        self._device_models = device_models
+        self.gpu_count = len(device_models)
+
+        gpu_models: dict[str, int] = {}
+        for _, gpu_model in device_models:
+            if gpu_model is not None:
+                gpu_models[gpu_model] = gpu_models.get(gpu_model, 0) + 1
+        self.gpu_models = "; ".join(
+            f"{gpu_count}x {gpu_model}" for gpu_model, gpu_count in gpu_models.items()
+        )
+        self.gpu_model_list = ", ".join(
+            gpu_model.replace("GeForce ", "")
+            for _, gpu_model in device_models
+            if gpu_model is not None
+        )
+        return True
+
+    def _temperatures(self) -> dict[int, tuple]:
+        """Temperatures of the devices for the change detection."""
+        return {
+            device_id: (device.gpu_temp, device.vram_temp, device.hotspot_temp)
+            for device_id, device in self.devices.items()
+        }
+
+    def _is_changing(self, old_temperatures: dict, old_speeds: dict) -> bool:
+        """Whether the temperatures, hashrates or the mined algorithms changed."""
+        if old_speeds.keys() != self._worker_speeds.keys():
+            return True
+        for pair, speed in self._worker_speeds.items():
+            old_speed = old_speeds[pair]
+            if speed is None or old_speed is None:
+                if speed != old_speed:
+                    return True
+            elif abs(speed - old_speed) > ADAPTIVE_HASHRATE_DELTA * max(
+                abs(old_speed), 1
+            ):
+                return True
+
+        temperatures = self._temperatures()
+        if old_temperatures.keys() != temperatures.keys():
+            return True
+        for device_id, values in temperatures.items():
+            for value, old_value in zip(values, old_temperatures[device_id]):
+                if value is None or old_value is None:
+                    if value != old_value:
+                        return True
+                elif abs(value - old_value) >= ADAPTIVE_TEMPERATURE_DELTA:
+                    return True
+        return False
+
+    def _is_hot(self) -> bool:
+        """Whether a GPU is too hot or close to it."""
+        return any(
+            device.too_hot
+            or (
+                device.gpu_temp is not None
+                and device.gpu_temp >= ADAPTIVE_HOT_TEMPERATURE
+            )
+            for device in self.devices.values()
+        )
+
+    def _adapt_update_interval(self, active: bool) -> None:
+        """Poll fast while the rig is active, back off to the slow interval."""
+        if active:
+            update_interval = self._fast_interval
         else:
-            self.online = True
-        await self.publish_updates()
+            update_interval = min(self._update_interval * 2, self._slow_interval)
+        if update_interval == self._update_interval:
+            return
+        if self._enable_debug_logging:
+            _LOGGER.info(
+                "%s adaptive update interval %s s", self._name, update_interval
+            )
+        self._update_interval = update_interval
+        self._scheduler.update_interval(self, update_interval)
+        self._async_publish({UPDATE_KEY_MODE})
+
+    def _record_history(
+        self, update_keys: set, devices_polled: bool, workers_polled: bool
+    ) -> None:
+        """Append the polled values to the history, add keys of changed stats."""
+        if devices_polled:
+            for device_id in self._device_history.keys() - self.devices.keys():
+                del self._device_history[device_id]
+            for device_id, device in self.devices.items():
+                buffers = self._device_history.get(device_id)
+                if buffers is None:
+                    buffers = self._device_history[device_id] = {
+                        field: RingBuffer(HISTORY_SIZE, HISTORY_EMA_ALPHA)
+                        for field in HISTORY_DEVICE_FIELDS
+                    }
+                for field, buffer in buffers.items():
+                    if _append_sample(buffer, getattr(device, field)):
+                        update_keys.add((UPDATE_KEY_HISTORY, device_id))
+
+        if workers_polled:
+            for pair in self._speed_history.keys() - self._worker_speeds.keys():
+                del self._speed_history[pair]
+            for pair, speed in self._worker_speeds.items():
+                buffer = self._speed_history.get(pair)
+                if buffer is None:
+                    buffer = self._speed_history[pair] = RingBuffer(
+                        HISTORY_SIZE, HISTORY_EMA_ALPHA
+                    )
+                if _append_sample(buffer, speed):
+                    update_keys.add((UPDATE_KEY_HISTORY, *pair))
+
+    def _update_algorithm_speeds(self, update_keys: set) -> None:
+        """Sum the worker speeds by algorithm, add the keys of changed sums.
+
+        algorithm.list is only polled with the inventory, the workers on
+        every poll.
+        """
+        algorithm_speeds: dict[int, float] = {}
+        for (_, algorithm_id), speed in self._worker_speeds.items():
+            if speed is not None:
+                algorithm_speeds[algorithm_id] = (
+                    algorithm_speeds.get(algorithm_id, 0.0) + speed
+                )
+        for algorithm_id in algorithm_speeds.keys() | self._algorithm_speeds.keys():
+            if algorithm_speeds.get(algorithm_id) != self._algorithm_speeds.get(
+                algorithm_id
+            ):
+                update_keys.add((UPDATE_KEY_ALGORITHM_SPEED, algorithm_id))
+        self._algorithm_speeds = algorithm_speeds
+
+    def _update_efficiency(self, update_keys: set) -> None:
+        """Derive the efficiencies from the power and speeds, add changed keys."""
+        device_efficiency = {}
+        total_speed = 0.0
+        for device_id, device in self.devices.items():
+            worker = self._device_workers.get(device.uuid)
+            speed = 0.0
+            if worker is not None:
+                speed = (
+                    sum(
+                        algorithm.speed
+                        for algorithm in worker.algorithms.values()
+                        if algorithm.speed is not None
+                    )
+                    / 1000000
+                )
+            total_speed += speed
+            efficiency = None
+            if speed and device.gpu_power_usage:
+                efficiency = round(speed / device.gpu_power_usage, 4)
+            device_efficiency[device_id] = efficiency
+            if self.device_efficiency.get(device_id) != efficiency:
+                update_keys.add((UPDATE_KEY_EFFICIENCY, device_id))
+        self.device_efficiency = device_efficiency
+
+        rig_efficiency = None
+        if total_speed and self.total_power:
+            rig_efficiency = round(self.total_power / total_speed, 4)
+        if rig_efficiency != self.rig_efficiency:
+            self.rig_efficiency = rig_efficiency
+            update_keys.add(UPDATE_KEY_EFFICIENCY)
+
+    def _build_indexes(self) -> None:
+        """Index workers and algorithms for the lookups of the entities."""
+        self._device_workers = {}
+        self._worker_speeds = {}
+        for worker in self.workers.values():
+            self._device_workers[worker.device_uuid] = worker
+            for algorithm_id, algorithm in worker.algorithms.items():
+                self._worker_speeds[(worker.device_uuid, algorithm_id)] = (
+                    algorithm.speed
+                )
+        self._algorithm_ids = {
+            algorithm.name: algorithm_id
+            for algorithm_id, algorithm in self.algorithms.items()
+        }
 
-    async def publish_updates(self) -> None:
-        """Schedule call all registered callbacks."""
-        for callback in self._callbacks:
-            callback()
+    async def publish_updates(self, update_keys: set | None = None) -> None:
+        """Call the callbacks registered for the update keys, all if None."""
+        self._async_publish(update_keys)
+
+    @callback
+    def _async_publish(self, update_keys: Iterable[Hashable] | None) -> None:
+        """Call the callbacks registered for the update keys, all if None."""
+        if update_keys is None:
+            update_keys = self._listeners.keys()
+        callbacks = set()
+        for key in update_keys:
+            callbacks.update(self._listeners.get(key, ()))
+        for listener in callbacks:
+            listener()
 
     def set_update_interval(self, hass: HomeAssistant, update_interval: int) -> None:
         """Set new update interval."""
-        if self._remove_update_listener:
-            self._remove_update_listener()
-        self._remove_update_listener = (
-            homeassistant.helpers.event.async_track_time_interval(
-                hass, self.update, datetime.timedelta(seconds=update_interval)
-            )
+        self._update_interval = update_interval
+        self._scheduler.set_interval(self, update_interval)
+        self._async_publish({UPDATE_KEY_MODE})
+
+    def set_update_intervals(self, slow_interval: int, fast_interval: int) -> None:
+        """Set new slow and fast update intervals, keep the update mode."""
+        self._slow_interval = slow_interval
+        self._fast_interval = fast_interval
+        self.set_update_mode(self.update_mode)
+
+    def set_update_mode(self, update_mode: str) -> None:
+        """Poll slow, fast or adaptive, adaptive starts fast."""
+        self.update_mode = update_mode
+        if update_mode == UPDATE_MODE_SLOW:
+            self.set_update_interval(self._hass, self._slow_interval)
+        else:
+            self.set_update_interval(self._hass, self._fast_interval)
+
+    def set_idle_timeout(self, idle_timeout: int) -> None:
+        """Set minutes after which idle hashrate sensors are removed, 0 never."""
+        self._idle_timeout = idle_timeout * 60
+
+    async def update_connection(
+        self,
+        host_address: str,
+        host_port: int,
+        auth_token: str,
+        transport: str,
+        connect_timeout: float,
+        read_timeout: float,
+    ) -> None:
+        """Set new connection settings."""
+        await self._api.update_connection(
+            host_address,
+            host_port,
+            auth_token,
+            transport,
+            connect_timeout,
+            read_timeout,
         )
 
-    def update_auth_token(self, token: str) -> None:
-        """Set new auth token."""
-        self._api.update_auth_token(token)
+    async def close(self) -> None:
+        """Stop updating and close the connection to the MiningRig."""
+        await self._scheduler.async_remove_rig(self)
+        if self._update_task is not None and not self._update_task.done():
+            self._update_task.cancel()
+        await self._api.close()
 
     def get_algorithm(self, algorithm_id) -> Algorithm | None:
         """Get algorithm by id."""
@@ -117,14 +1018,70 @@ class MiningRig:
             return self.workers[worker_id]
         return None
 
+    def get_device_worker(self, device_uuid: str) -> Worker | None:
+        """Get the worker of a device."""
+        return self._device_workers.get(device_uuid)
+
+    def get_worker_speed(self, device_uuid: str, algorithm_id: int) -> float | None:
+        """Get the speed of an algorithm on a device, None if not mined."""
+        return self._worker_speeds.get((device_uuid, algorithm_id))
+
+    def get_device_history(self, device_id: int, field: str) -> RingBuffer | None:
+        """Get the history of a device value, field of HISTORY_DEVICE_FIELDS."""
+        buffers = self._device_history.get(device_id)
+        if buffers is None:
+            return None
+        return buffers.get(field)
+
+    def get_speed_history(
+        self, device_uuid: str, algorithm_id: int
+    ) -> RingBuffer | None:
+        """Get the history of the speed of an algorithm on a device."""
+        return self._speed_history.get((device_uuid, algorithm_id))
+
+    def get_algorithm_speed(self, algorithm_id: int) -> float | None:
+        """Get the speed of an algorithm on all workers, None if unknown."""
+        if algorithm_id not in self.algorithms:
+            return None
+        return self._algorithm_speeds.get(algorithm_id, 0.0)
+
+    def get_algorithm_id(self, algorithm_name: str) -> int | None:
+        """Get algorithm id by name."""
+        return self._algorithm_ids.get(algorithm_name)
+
     async def device_add_algorithm(self, device_id: int, algorithm: str) -> bool:
         """Add algorith to worker"""
         return await self._api.device_add_algorithm(device_id, algorithm)
 
     async def add_algorith(self, algorithm: str) -> bool:
         """Add algorith to rig"""
+        self._inventory_stale = True
         return await self._api.add_algorithm(algorithm)
 
     async def worker_free(self, worker_id: int) -> bool:
         """Free worker"""
         return await self._api.worker_free(worker_id)
+
+    async def set_device_algorithm(self, device_uuid: str, algorithm: str) -> bool:
+        """Mine an algorithm on a device, ALGORITHM_NONE frees it, no update.
+
+        The running worker of the device is freed before the new one is added.
+        A GPU stopped by the governor is not resumed after a user command.
+        """
+        if self.governor_stopped.pop(device_uuid, None) is not None:
+            self._async_save_inventory()
+            _LOGGER.info(
+                "%s GPU %s set to %s, not resumed by the governor",
+                self._name,
+                device_uuid,
+                algorithm,
+            )
+        worker = self.get_device_worker(device_uuid)
+        if worker is not None:
+            if self.get_algorithm_id(algorithm) in worker.algorithms:
+                return True
+            if not await self.worker_free(worker.id):
+                return False
+        if algorithm == ALGORITHM_NONE:
+            return True
+        return await self.device_add_algorithm(device_uuid, algorithm)
@@ -0,0 +1,127 @@
+"""Polling scheduler shared by all MiningRigs."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import DOMAIN, MAX_CONCURRENT_REQUESTS, SCHEDULER
+
+if TYPE_CHECKING:
+    from .mining_rig import MiningRig
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> PollScheduler:
+    """Get the scheduler of the integration, create it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if SCHEDULER not in domain_data:
+        domain_data[SCHEDULER] = PollScheduler(hass)
+    return domain_data[SCHEDULER]
+
+
+class PollScheduler:
+    """Schedules the updates of all MiningRigs.
+
+    Every rig polls at its own interval. A new rig is placed in the largest
+    gap between the updates of the other rigs, so they don't fire at the
+    same time, the other rigs keep their deadlines. The rigs share the HTTP
+    session of Home Assistant and a limit of concurrent requests.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Init PollScheduler."""
+        self._hass = hass
+        self._intervals: dict[MiningRig, float] = {}
+        self._next_update: dict[MiningRig, float] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self.request_limit = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # closed by Home Assistant on shutdown, the rigs of all entries use it
+        self.session = async_get_clientsession(hass)
+
+    def set_interval(self, mining_rig: MiningRig, update_interval: float) -> None:
+        """Set the update interval of a rig, add the rig if it is new.
+
+        Only the rig itself is moved, the other rigs keep their deadlines.
+        """
+        if mining_rig in self._intervals:
+            self.update_interval(mining_rig, update_interval)
+            return
+        self._intervals[mining_rig] = update_interval
+        self._next_update[mining_rig] = self._free_phase(update_interval)
+        self._schedule()
+
+    def update_interval(self, mining_rig: MiningRig, update_interval: float) -> None:
+        """Change the interval of a rig without moving the other rigs."""
+        if self._intervals.get(mining_rig, update_interval) == update_interval:
+            return
+        self._intervals[mining_rig] = update_interval
+        self._next_update[mining_rig] = self._hass.loop.time() + update_interval
+        self._schedule()
+
+    async def async_remove_rig(self, mining_rig: MiningRig) -> None:
+        """Stop updating a rig, close the scheduler after the last rig."""
+        self._intervals.pop(mining_rig, None)
+        self._next_update.pop(mining_rig, None)
+        if self._intervals:
+            self._schedule()
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._hass.data[DOMAIN].pop(SCHEDULER, None)
+
+    def _free_phase(self, update_interval: float) -> float:
+        """First update of a new rig, in the middle of the largest gap.
+
+        The updates of the other rigs during one interval of the new rig are
+        folded into that interval, the gap after the last one wraps around.
+        """
+        now = self._hass.loop.time()
+        phases = []
+        for mining_rig, next_update in self._next_update.items():
+            other_interval = self._intervals[mining_rig]
+            end = next_update + update_interval
+            while next_update < end:
+                phases.append((next_update - now) % update_interval)
+                next_update += other_interval
+        if not phases:
+            return now + update_interval
+        phases.sort()
+        start, gap = phases[-1], phases[0] + update_interval - phases[-1]
+        for previous, following in zip(phases, phases[1:]):
+            if following - previous > gap:
+                start, gap = previous, following - previous
+        # the first update of the rig runs at setup, not right after it
+        return now + ((start + gap / 2) % update_interval or update_interval)
+
+    def _schedule(self) -> None:
+        """Set the timer to the next update that is due."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._next_update:
+            self._timer = self._hass.loop.call_at(
+                min(self._next_update.values()), self._run_due_updates
+            )
+
+    @callback
+    def _run_due_updates(self) -> None:
+        """Start the updates that are due."""
+        self._timer = None
+        now = self._hass.loop.time()
+        for mining_rig, next_update in self._next_update.items():
+            if next_update > now:
+                continue
+            mining_rig.async_scheduled_update()
+            update_interval = self._intervals[mining_rig]
+            while next_update <= now:
+                next_update += update_interval
+            self._next_update[mining_rig] = next_update
+        self._schedule()
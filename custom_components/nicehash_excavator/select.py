@@ -8,9 +8,14 @@ from homeassistant.core import HomeAssistant
 from homeassistant.components.select import SelectEntity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, CONFIG_NAME
-from .mining_rig import MiningRig
-from .sensor import DeviceSensorBase
+from .const import ALGORITHM_NONE, DOMAIN, CONFIG_NAME, UPDATE_MODES
+from .mining_rig import (
+    UPDATE_KEY_ALGORITHM_NAMES,
+    UPDATE_KEY_MODE,
+    UPDATE_KEY_WORKER,
+    MiningRig,
+)
+from .sensor import DeviceSensorBase, RigSensor
 from .data_containers import Algorithm
 # from .common import *
 # from .services import *
@@ -23,11 +28,18 @@ async def async_setup_entry(
     hass: HomeAssistant, config: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> bool:
     mining_rig: MiningRig = hass.data[DOMAIN][config.entry_id]
-    new_devices = []
-    for device_id in mining_rig.devices:
-        new_devices.append(AlgorithSelector(mining_rig, config, device_id))
 
-    async_add_entities(new_devices)
+    async_add_entities([UpdateModeSelector(mining_rig, config)])
+
+    def create_entities(
+        device_ids: set, algorithm_ids: set, worker_algorithms: set
+    ) -> list[SelectEntity]:
+        """Create the selectors of new devices."""
+        return [
+            AlgorithSelector(mining_rig, config, device_id) for device_id in device_ids
+        ]
+
+    mining_rig.register_entity_factory(async_add_entities, create_entities)
 
     return True
 
@@ -48,6 +60,10 @@ class AlgorithSelector(SelectEntity, DeviceSensorBase):
         super(AlgorithSelector, self).__init__(mining_rig, config_entry, device_id)
         self._rig_name = config_entry.data.get(CONFIG_NAME)
         self.algorithms: dict[int, Algorithm] = mining_rig.algorithms
+        self._options: list[str] = []
+        self._options_version: int | None = None
+        # shown until the worker.list after a selection confirms it
+        self._optimistic_option: str | None = None
 
     @property
     def name(self) -> str:
@@ -57,42 +73,89 @@ class AlgorithSelector(SelectEntity, DeviceSensorBase):
     def unique_id(self) -> str:
         return f"{self._rig_name}_{self._device_uuid}_algorithm"
 
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return ((UPDATE_KEY_WORKER, self._device_uuid), UPDATE_KEY_ALGORITHM_NAMES)
+
     @property
     def options(self) -> [str]:
-        options = ["None"]
-        if self.algorithms:
-            for a in self.algorithms.values():
-                options.append(a.name)
-        return options
+        """Algorithms of the rig, rebuilt only when the algorithms changed."""
+        if self._options_version != self._mining_rig.algorithms_version:
+            self._options = [ALGORITHM_NONE] + [
+                a.name for a in self.algorithms.values()
+            ]
+            self._options_version = self._mining_rig.algorithms_version
+        return self._options
+
+    @property
+    def current_option(self) -> str:
+        if self._optimistic_option is not None:
+            return self._optimistic_option
+        worker = self._mining_rig.get_device_worker(self._device_uuid)
+        if worker is not None:
+            for a in worker.algorithms.values():
+                return a.name
+        return ALGORITHM_NONE
+
+    async def async_select_option(self, option: str) -> None:
+        """Show the option right away, confirm it with a worker.list."""
+        if (
+            option == self.current_option
+            and self._device_uuid not in self._mining_rig.governor_stopped
+        ):
+            return
+        self._optimistic_option = option
+        self.async_write_ha_state()
+        try:
+            await self._mining_rig.set_device_algorithm(self._device_uuid, option)
+            await self._mining_rig.update_workers()
+        finally:
+            self._optimistic_option = None
+        # the confirmed worker replaces the optimistic option
+        self.async_write_ha_state()
+        if self.current_option != option:
+            if self._enable_debug_logging:
+                _LOGGER.warning(
+                    "%s %s did not switch to %s",
+                    self._rig_name,
+                    self._device_name,
+                    option,
+                )
+        elif (
+            option != ALGORITHM_NONE
+            and self._mining_rig.get_algorithm_id(option) is None
+        ):
+            await self._mining_rig.add_algorith(option)
+
+
+class UpdateModeSelector(SelectEntity, RigSensor):
+    """Update mode selector"""
+
+    _attr_options = UPDATE_MODES
+
+    @property
+    def name(self) -> str:
+        return f"{self._rig_name} update mode"
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._rig_name}_update_mode"
+
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return (UPDATE_KEY_MODE,)
+
+    @property
+    def available(self) -> bool:
+        """The update mode can also be changed while the rig is offline."""
+        return True
 
     @property
     def current_option(self) -> str:
-        for w in self._mining_rig.workers.values():
-            if w.device_uuid == self._device_uuid:
-                for a in w.algorithms.values():
-                    return a.name
-        return "None"
+        return self._mining_rig.update_mode
 
     async def async_select_option(self, option: str) -> None:
-        """Change the selected option."""
-        match option:
-            case "None":
-                worker_id = -1
-                for w in self._mining_rig.workers.values():
-                    if w.device_uuid == self._device_uuid:
-                        worker_id = w.id
-                        break
-                if worker_id != -1:
-                    await self._mining_rig.worker_free(worker_id)
-                    await self._mining_rig.update()
-
-            case _:
-                await self._mining_rig.device_add_algorithm(self._device_uuid, option)
-                await self._mining_rig.update()
-                found = False
-                for alg in self._mining_rig.algorithms.values():
-                    if alg.name == option:
-                        found = True
-                        break
-                if not found:
-                    await self._mining_rig.add_algorith(option)
+        """Change the update mode."""
+        self._mining_rig.set_update_mode(option)
@@ -1,16 +1,51 @@
 """Sensor integration."""
 
 import logging
+import time
 
 from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfPower, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfPower,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-
-from .const import CONFIG_ENABLE_DEBUG_LOGGING, CONFIG_NAME, DOMAIN
-from .mining_rig import MiningRig
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    CONFIG_DEADBAND_FAN,
+    CONFIG_DEADBAND_HASHRATE,
+    CONFIG_DEADBAND_POWER,
+    CONFIG_DEADBAND_TEMPERATURE,
+    CONFIG_ENABLE_DEBUG_LOGGING,
+    CONFIG_NAME,
+    DOMAIN,
+)
+from .history import RingBuffer
+from .mining_rig import (
+    UPDATE_KEY_ALGORITHM,
+    UPDATE_KEY_ALGORITHM_SPEED,
+    UPDATE_KEY_DEVICE,
+    UPDATE_KEY_DEVICES,
+    UPDATE_KEY_EFFICIENCY,
+    UPDATE_KEY_FANOUT,
+    UPDATE_KEY_GPU_MODELS,
+    UPDATE_KEY_HISTORY,
+    UPDATE_KEY_INFO,
+    UPDATE_KEY_MODE,
+    UPDATE_KEY_POLL,
+    UPDATE_KEY_STATS,
+    UPDATE_KEY_STATUS,
+    UPDATE_KEY_WORKER,
+    UPDATE_KEY_WORKER_ALGORITHM,
+    MiningRig,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,39 +67,103 @@ async def async_setup_entry(
     new_devices.append(TotalPowerSensor(mining_rig, config_entry))
     new_devices.append(CPUSensor(mining_rig, config_entry))
     new_devices.append(RAMSensor(mining_rig, config_entry))
+    new_devices.append(RigEfficiencySensor(mining_rig, config_entry))
+    new_devices.append(PollLatencySensor(mining_rig, config_entry))
+    new_devices.append(UpdateIntervalSensor(mining_rig, config_entry))
+    new_devices.append(CommandErrorsSensor(mining_rig, config_entry))
+    new_devices.append(SkippedPollsSensor(mining_rig, config_entry))
+    new_devices.append(FanoutTimeSensor(mining_rig, config_entry))
+
+    async_add_entities(new_devices)
+
+    def create_entities(
+        device_ids: set, algorithm_ids: set, worker_algorithms: set
+    ) -> list[Entity]:
+        """Create the sensors of new devices, algorithms and mined algorithms."""
+        new_devices = []
+        for device_id in device_ids:
+            new_devices.append(GpuTempSensor(mining_rig, config_entry, device_id))
+            new_devices.append(VRAMTempSensor(mining_rig, config_entry, device_id))
+            new_devices.append(HotspotTempSensor(mining_rig, config_entry, device_id))
+            new_devices.append(OvertempSensor(mining_rig, config_entry, device_id))
+            new_devices.append(FanSensor(mining_rig, config_entry, device_id))
+            new_devices.append(PowerSensor(mining_rig, config_entry, device_id))
+            new_devices.append(ModelSensor(mining_rig, config_entry, device_id))
+            new_devices.append(VendorSensor(mining_rig, config_entry, device_id))
+            new_devices.append(
+                GpuTempAverageSensor(mining_rig, config_entry, device_id)
+            )
+            new_devices.append(PowerAverageSensor(mining_rig, config_entry, device_id))
+            new_devices.append(FanAverageSensor(mining_rig, config_entry, device_id))
+            new_devices.append(EfficiencySensor(mining_rig, config_entry, device_id))
 
-    for device_id in mining_rig.devices:
-        new_devices.append(GpuTempSensor(mining_rig, config_entry, device_id))
-        new_devices.append(VRAMTempSensor(mining_rig, config_entry, device_id))
-        new_devices.append(HotspotTempSensor(mining_rig, config_entry, device_id))
-        new_devices.append(OvertempSensor(mining_rig, config_entry, device_id))
-        new_devices.append(FanSensor(mining_rig, config_entry, device_id))
-        new_devices.append(PowerSensor(mining_rig, config_entry, device_id))
-        new_devices.append(ModelSensor(mining_rig, config_entry, device_id))
-        new_devices.append(VendorSensor(mining_rig, config_entry, device_id))
-
-    for algorithm_id in mining_rig.algorithms:
-        new_devices.append(
-            AlgorithmHashrateSensor(mining_rig, config_entry, algorithm_id)
-        )
+        for algorithm_id in algorithm_ids:
+            new_devices.append(
+                AlgorithmHashrateSensor(mining_rig, config_entry, algorithm_id)
+            )
 
-        # TODO cleanup ids
-        for device_id in mining_rig.devices:
-            uuid = mining_rig.devices[device_id].uuid
+        # hashrate only of the algorithms the devices actually run
+        for device_uuid, algorithm_id in worker_algorithms:
             new_devices.append(
                 WorkerAlgorithmHashrateSensor(
-                    mining_rig, config_entry, uuid, algorithm_id
+                    mining_rig, config_entry, device_uuid, algorithm_id
+                )
+            )
+            new_devices.append(
+                WorkerAlgorithmHashrateAverageSensor(
+                    mining_rig, config_entry, device_uuid, algorithm_id
                 )
             )
+        return new_devices
 
-    if new_devices:
-        async_add_entities(new_devices)
+    mining_rig.register_entity_factory(async_add_entities, create_entities)
+    _async_remove_retired_pairs(hass, config_entry, mining_rig)
+
+
+def _worker_algorithm_unique_id(
+    rig_name: str, device_uuid: str, algorithm_name: str
+) -> str:
+    """Unique id of the hashrate sensor of a GPU and algorithm."""
+    return f"{rig_name}_{device_uuid}_alg_{algorithm_name}"
+
+
+@callback
+def _async_remove_retired_pairs(
+    hass: HomeAssistant, config_entry: ConfigEntry, mining_rig: MiningRig
+) -> None:
+    """Remove the hashrate sensors of pairs retired while they were not loaded.
+
+    Loaded sensors are retired with their pair. Disabled ones, or pairs that
+    went idle before a restart, are only found in the registry.
+    """
+    if not mining_rig.devices:
+        # nothing known about the rig yet
+        return
+    rig_name = config_entry.data.get(CONFIG_NAME)
+    unique_ids = set()
+    for device_uuid, algorithm_id in mining_rig.worker_algorithms:
+        unique_id = _worker_algorithm_unique_id(
+            rig_name, device_uuid, mining_rig.algorithms[algorithm_id].name
+        )
+        unique_ids.update((unique_id, f"{unique_id}_average"))
+    registry = er.async_get(hass)
+    for entry in er.async_entries_for_config_entry(registry, config_entry.entry_id):
+        if (
+            entry.domain == "sensor"
+            and entry.unique_id.startswith(f"{rig_name}_")
+            and "_alg_" in entry.unique_id[len(rig_name) + 1 :]
+            and entry.unique_id not in unique_ids
+        ):
+            registry.async_remove(entry.entity_id)
 
 
 class SensorBase(Entity):
     """Base representation of a Sensor."""
 
     should_poll = False
+    # high frequency sensors are written with the limits of the publish throttle
+    _throttle = False
+    _deadband_key: str | None = None
 
     def __init__(self, mining_rig: MiningRig, config_entry: ConfigEntry) -> None:
         """Initialize the sensor."""
@@ -74,19 +173,118 @@ class SensorBase(Entity):
             self._enable_debug_logging = config_entry.data[CONFIG_ENABLE_DEBUG_LOGGING]
         except KeyError:
             self._enable_debug_logging = False
+        self._written_at: float | None = None
+        self._written_state = None
+        self._written_available: bool | None = None
+        self._write_due: float | None = None
+        self._cancel_write: CALLBACK_TYPE | None = None
 
     @property
     def available(self) -> bool:
         """Return True if mining rig is available."""
         return self._mining_rig.online
 
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return (UPDATE_KEY_INFO,)
+
+    @property
+    def item_keys(self) -> tuple:
+        """Keys of the devices/algorithms this entity is removed with."""
+        return ()
+
     async def async_added_to_hass(self) -> None:
         """Run when this Entity has been added to HA."""
-        self._mining_rig.register_callback(self.async_write_ha_state)
+        self._mining_rig.register_callback(self._async_publish_state, self.update_keys)
+        self._mining_rig.register_entity_removal(self.async_retire, self.item_keys)
 
     async def async_will_remove_from_hass(self) -> None:
         """Entity being removed from hass."""
-        self._mining_rig.remove_callback(self.async_write_ha_state)
+        self._mining_rig.remove_callback(self._async_publish_state)
+        self._mining_rig.remove_entity_removal(self.async_retire)
+        if self._cancel_write is not None:
+            self._cancel_write()
+            self._cancel_write = None
+
+    async def async_retire(self) -> None:
+        """Remove the entity of a gone item, with its registry entry."""
+        if self.registry_entry is None:
+            await self.async_remove()
+            return
+        # the entity is removed from hass by the registry update
+        er.async_get(self.hass).async_remove(self.entity_id)
+
+    @callback
+    def _async_publish_state(self) -> None:
+        """Write the state, throttled sensors skip too early or small changes.
+
+        A skipped change is written later, after the minimum interval or at
+        the latest after the maximum age.
+        """
+        if (
+            not self._throttle
+            or self._written_at is None
+            or self.available != self._written_available
+        ):
+            self._async_write_state()
+            return
+        self._async_write_throttled()
+
+    @callback
+    def _async_write_throttled(self) -> None:
+        """Write the state now or later, by the limits of the publish throttle."""
+        throttle = self._mining_rig.publish_throttle
+        age = time.monotonic() - self._written_at
+        if age >= throttle.max_age:
+            # HA drops an unchanged state, the refresh is forced
+            self._async_write_state(force_update=True)
+        elif age < throttle.min_interval:
+            self._async_write_later(throttle.min_interval - age)
+        elif self._within_deadband(throttle.deadbands.get(self._deadband_key, 0)):
+            self._async_write_later(throttle.max_age - age)
+        else:
+            self._async_write_state()
+
+    def _within_deadband(self, deadband: float) -> bool:
+        """Whether the state moved less than the deadband since the last write."""
+        if not deadband:
+            return False
+        try:
+            return abs(float(self.state) - float(self._written_state)) <= deadband
+        except (TypeError, ValueError):
+            return self.state == self._written_state
+
+    @callback
+    def _async_write_later(self, delay: float) -> None:
+        """Write the state after the delay unless a write is due earlier."""
+        due = time.monotonic() + delay
+        if self._cancel_write is not None:
+            if self._write_due <= due:
+                return
+            self._cancel_write()
+        self._write_due = due
+        self._cancel_write = async_call_later(
+            self.hass, delay, self._async_write_delayed
+        )
+
+    @callback
+    def _async_write_delayed(self, now) -> None:
+        """Write the state skipped before, unless it is back in the deadband."""
+        self._cancel_write = None
+        self._async_write_throttled()
+
+    @callback
+    def _async_write_state(self, force_update: bool = False) -> None:
+        """Write the state to HA and remember it."""
+        if self._cancel_write is not None:
+            self._cancel_write()
+            self._cancel_write = None
+        self._attr_force_update = force_update
+        self.async_write_ha_state()
+        self._written_at = time.monotonic()
+        self._written_state = self.state
+        self._written_available = self.available
 
 
 class RigSensor(SensorBase):
@@ -106,44 +304,22 @@ class RigSensor(SensorBase):
             "name": f"{self._rig_name}",
             "manufacturer": "NiceHash",
         }
-        try:
+        if self._mining_rig.info is not None:
             info["sw_version"] = (
                 f"{self._mining_rig.info.version}, Build: {self._mining_rig.info.build_number}"
             )
-
-            # info["uptime"] = f"{self._mining_rig.info.uptime / 60 / 60}h"
-
-            gpu_models: dict[str, int]
-            gpu_models = {}
-            for device_id in self._mining_rig.devices:
-                gpu_model = self._mining_rig.get_device(device_id).name
-                if gpu_model in gpu_models:
-                    gpu_count = gpu_models[gpu_model]
-                    gpu_models[gpu_model] = gpu_count + 1
-                else:
-                    gpu_models[gpu_model] = 1
-
-            model_string = ""
-            for gpu_model, gpu_count in gpu_models.items():
-                if model_string:
-                    model_string = (
-                        model_string + "; " + str(gpu_count) + "x " + gpu_model
-                    )
-                else:
-                    model_string = str(gpu_count) + "x " + gpu_model
-
-            info["model"] = model_string
-        except (AttributeError, TypeError) as error:
-            if self._enable_debug_logging:
-                _LOGGER.info(error)
+            info["model"] = self._mining_rig.gpu_models
+        else:
             info["model"] = "No GPUs found"
-            # info["uptime"] = "Not available"
         return info
 
 
 class DeviceSensorBase(SensorBase):
     """Base representation of a Graphics device Sensor."""
 
+    # GraphicsCard attribute of the state, only its changes are written
+    _device_field: str | None = None
+
     VENDOR_MAP = {
         "10DE": "NVIDIA",
         "1002": "AMD",
@@ -176,6 +352,16 @@ class DeviceSensorBase(SensorBase):
         self._device_name = f"GPU {device_id}"
         self._device_uuid = mining_rig.get_device(device_id).uuid
 
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return ((UPDATE_KEY_DEVICE, self._device_id, self._device_field),)
+
+    @property
+    def item_keys(self) -> tuple:
+        """Keys of the devices/algorithms this entity is removed with."""
+        return ((UPDATE_KEY_DEVICE, self._device_id),)
+
     @property
     def device_info(self) -> any:
         """Information about this entity/device."""
@@ -216,6 +402,9 @@ class GpuTempSensor(DeviceSensorBase):
 
     device_class = SensorDeviceClass.TEMPERATURE
     _attr_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _throttle = True
+    _deadband_key = CONFIG_DEADBAND_TEMPERATURE
+    _device_field = "gpu_temp"
 
     @property
     def name(self) -> str:
@@ -240,6 +429,9 @@ class VRAMTempSensor(DeviceSensorBase):
 
     device_class = SensorDeviceClass.TEMPERATURE
     _attr_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _throttle = True
+    _deadband_key = CONFIG_DEADBAND_TEMPERATURE
+    _device_field = "vram_temp"
 
     @property
     def name(self) -> str:
@@ -264,6 +456,9 @@ class HotspotTempSensor(DeviceSensorBase):
 
     device_class = SensorDeviceClass.TEMPERATURE
     _attr_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _throttle = True
+    _deadband_key = CONFIG_DEADBAND_TEMPERATURE
+    _device_field = "hotspot_temp"
 
     @property
     def name(self) -> str:
@@ -287,6 +482,9 @@ class FanSensor(DeviceSensorBase):
     """Fan Sensor."""
 
     _attr_unit_of_measurement = PERCENTAGE
+    _throttle = True
+    _deadband_key = CONFIG_DEADBAND_FAN
+    _device_field = "gpu_fan_speed"
 
     @property
     def name(self) -> str:
@@ -306,9 +504,113 @@ class FanSensor(DeviceSensorBase):
             return "unavailable"
 
 
+class DeviceAverageSensorBase(DeviceSensorBase):
+    """Rolling average of a device value, min, max and EMA as attributes."""
+
+    _field: str
+    _throttle = True
+
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return ((UPDATE_KEY_HISTORY, self._device_id),)
+
+    @property
+    def state(self) -> float:
+        buffer = self._mining_rig.get_device_history(self._device_id, self._field)
+        if buffer is None or buffer.mean is None:
+            return "unavailable"
+        return round(buffer.mean, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        return _statistics_attributes(
+            self._mining_rig.get_device_history(self._device_id, self._field)
+        )
+
+
+class GpuTempAverageSensor(DeviceAverageSensorBase):
+    """Average GPU temp Sensor."""
+
+    device_class = SensorDeviceClass.TEMPERATURE
+    _attr_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _field = "gpu_temp"
+    _deadband_key = CONFIG_DEADBAND_TEMPERATURE
+
+    @property
+    def name(self) -> str:
+        return f"{self._rig_name} {self._device_name} GPU average"
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._rig_name}_{self._device_uuid}_temp_average"
+
+
+class PowerAverageSensor(DeviceAverageSensorBase):
+    """Average Power Sensor."""
+
+    device_class = SensorDeviceClass.POWER
+    _attr_unit_of_measurement = UnitOfPower.WATT
+    _field = "gpu_power_usage"
+    _deadband_key = CONFIG_DEADBAND_POWER
+
+    @property
+    def name(self) -> str:
+        return f"{self._rig_name} {self._device_name} Power average"
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._rig_name}_{self._device_uuid}_power_average"
+
+
+class FanAverageSensor(DeviceAverageSensorBase):
+    """Average Fan Sensor."""
+
+    _attr_unit_of_measurement = PERCENTAGE
+    _field = "gpu_fan_speed"
+    _deadband_key = CONFIG_DEADBAND_FAN
+
+    @property
+    def name(self) -> str:
+        return f"{self._rig_name} {self._device_name} Fan average"
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._rig_name}_{self._device_uuid}_fan_average"
+
+
+class EfficiencySensor(DeviceSensorBase):
+    """Hashrate per Watt Sensor."""
+
+    _attr_unit_of_measurement = "Mh/J"
+    _throttle = True
+
+    @property
+    def name(self) -> str:
+        return f"{self._rig_name} {self._device_name} Efficiency"
+
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return ((UPDATE_KEY_EFFICIENCY, self._device_id),)
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._rig_name}_{self._device_uuid}_efficiency"
+
+    @property
+    def state(self) -> float:
+        efficiency = self._mining_rig.device_efficiency.get(self._device_id)
+        if efficiency is None:
+            return "unavailable"
+        return efficiency
+
+
 class OvertempSensor(DeviceSensorBase):
     """Overtemp Sensor."""
 
+    _device_field = "too_hot"
+
     @property
     def name(self) -> str:
         return f"{self._rig_name} {self._device_name} Overtemp"
@@ -332,6 +634,9 @@ class PowerSensor(DeviceSensorBase):
 
     device_class = SensorDeviceClass.POWER
     _attr_unit_of_measurement = UnitOfPower.WATT
+    _throttle = True
+    _deadband_key = CONFIG_DEADBAND_POWER
+    _device_field = "gpu_power_usage"
 
     @property
     def name(self) -> str:
@@ -354,6 +659,8 @@ class PowerSensor(DeviceSensorBase):
 class ModelSensor(DeviceSensorBase):
     """Model Sensor."""
 
+    _device_field = "name"
+
     @property
     def name(self) -> str:
         return f"{self._rig_name} {self._device_name} GPU Model"
@@ -375,6 +682,8 @@ class ModelSensor(DeviceSensorBase):
 class VendorSensor(DeviceSensorBase):
     """Vendor Sensor."""
 
+    _device_field = "subvendor"
+
     @property
     def name(self) -> str:
         return f"{self._rig_name} {self._device_name} Vendor ID"
@@ -397,6 +706,8 @@ class WorkerAlgorithmHashrateSensor(DeviceSensorBase):
     """Hashrate Sensor per GPU and Algorithm ."""
 
     _attr_unit_of_measurement = "Mh/s"
+    _throttle = True
+    _deadband_key = CONFIG_DEADBAND_HASHRATE
 
     def __init__(
         self,
@@ -416,6 +727,20 @@ class WorkerAlgorithmHashrateSensor(DeviceSensorBase):
         self._algorithm_id = algorithm_id
         self.algorithm_name = mining_rig.algorithms[algorithm_id].name
 
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return ((UPDATE_KEY_WORKER, self._device_uuid),)
+
+    @property
+    def item_keys(self) -> tuple:
+        """Keys of the devices/algorithms this entity is removed with."""
+        return (
+            (UPDATE_KEY_DEVICE, self._device_id),
+            (UPDATE_KEY_ALGORITHM, self._algorithm_id),
+            (UPDATE_KEY_WORKER_ALGORITHM, self._device_uuid, self._algorithm_id),
+        )
+
     @property
     def name(self) -> str:
         try:
@@ -428,7 +753,9 @@ class WorkerAlgorithmHashrateSensor(DeviceSensorBase):
     @property
     def unique_id(self) -> str:
         try:
-            return f"{self._rig_name}_{self._device_uuid}_alg_{self.algorithm_name}"
+            return _worker_algorithm_unique_id(
+                self._rig_name, self._device_uuid, self.algorithm_name
+            )
         except AttributeError as error:
             if self._enable_debug_logging:
                 _LOGGER.info(error)
@@ -437,15 +764,14 @@ class WorkerAlgorithmHashrateSensor(DeviceSensorBase):
     @property
     def state(self) -> float:
         try:
-            for worker in self._mining_rig.workers.values():
-                if worker.device_uuid == self._device_uuid:
-                    for algs in worker.algorithms:
-                        if algs == self._algorithm_id:
-                            algorithm = worker.algorithms[self._algorithm_id]
-                            return round(
-                                algorithm.speed / 1000000,
-                                2,
-                            )
+            speed = self._mining_rig.get_worker_speed(
+                self._device_uuid, self._algorithm_id
+            )
+            if speed is not None:
+                return round(
+                    speed / 1000000,
+                    2,
+                )
 
         except (AttributeError, TypeError) as error:
             if self._enable_debug_logging:
@@ -453,10 +779,57 @@ class WorkerAlgorithmHashrateSensor(DeviceSensorBase):
         return "unavailable"
 
 
+def _statistics_attributes(buffer: RingBuffer | None, scale: float = 1) -> dict:
+    """Rolling min, max and EMA of a history as state attributes."""
+    if buffer is None or not len(buffer):
+        return {}
+    return {
+        "min": round(buffer.min / scale, 2),
+        "max": round(buffer.max / scale, 2),
+        "ema": round(buffer.ema / scale, 2),
+        "samples": len(buffer),
+    }
+
+
+class WorkerAlgorithmHashrateAverageSensor(WorkerAlgorithmHashrateSensor):
+    """Rolling average hashrate Sensor per GPU and Algorithm."""
+
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return ((UPDATE_KEY_HISTORY, self._device_uuid, self._algorithm_id),)
+
+    @property
+    def name(self) -> str:
+        return f"{super().name} average"
+
+    @property
+    def unique_id(self) -> str:
+        return f"{super().unique_id}_average"
+
+    @property
+    def state(self) -> float:
+        buffer = self._mining_rig.get_speed_history(
+            self._device_uuid, self._algorithm_id
+        )
+        if buffer is None or buffer.mean is None:
+            return "unavailable"
+        return round(buffer.mean / 1000000, 2)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        return _statistics_attributes(
+            self._mining_rig.get_speed_history(self._device_uuid, self._algorithm_id),
+            1000000,
+        )
+
+
 class AlgorithmHashrateSensor(RigSensor):
     """Hashrate Sensor per Algorithm."""
 
     _attr_unit_of_measurement = "Mh/s"
+    _throttle = True
+    _deadband_key = CONFIG_DEADBAND_HASHRATE
 
     def __init__(
         self, mining_rig: MiningRig, config_entry: ConfigEntry, algorithm_id: int
@@ -465,6 +838,19 @@ class AlgorithmHashrateSensor(RigSensor):
         super().__init__(mining_rig, config_entry)
         self._algorithm_id = algorithm_id
 
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return (
+            (UPDATE_KEY_ALGORITHM, self._algorithm_id),
+            (UPDATE_KEY_ALGORITHM_SPEED, self._algorithm_id),
+        )
+
+    @property
+    def item_keys(self) -> tuple:
+        """Keys of the devices/algorithms this entity is removed with."""
+        return ((UPDATE_KEY_ALGORITHM, self._algorithm_id),)
+
     @property
     def name(self) -> str:
         try:
@@ -486,9 +872,10 @@ class AlgorithmHashrateSensor(RigSensor):
     @property
     def state(self) -> float:
         try:
-            algorithm = self._mining_rig.get_algorithm(self._algorithm_id)
+            # summed from the workers, algorithm.list is polled less often
+            speed = self._mining_rig.get_algorithm_speed(self._algorithm_id)
             return round(
-                algorithm.speed / 1000000,
+                speed / 1000000,
                 2,
             )
         except (AttributeError, TypeError) as error:
@@ -508,10 +895,27 @@ class OnlineSensor(RigSensor):
     def unique_id(self) -> str:
         return f"{self._rig_name}_status"
 
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return (UPDATE_KEY_STATUS,)
+
+    @property
+    def available(self) -> bool:
+        """The status is also reported while the rig is offline."""
+        return True
+
     @property
     def state(self) -> str:
         return "Online" if self._mining_rig.online else "Offline"
 
+    @property
+    def extra_state_attributes(self) -> dict:
+        return {
+            "circuit_breaker": self._mining_rig.circuit_breaker_state,
+            "consecutive_failures": self._mining_rig.consecutive_failures,
+        }
+
 
 class GpuModelsSensor(RigSensor):
     """Gpu models Sensor"""
@@ -520,24 +924,19 @@ class GpuModelsSensor(RigSensor):
     def name(self) -> str:
         return f"{self._rig_name} GPU models"
 
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return (UPDATE_KEY_GPU_MODELS,)
+
     @property
     def unique_id(self) -> str:
         return f"{self._rig_name}_gpu_models"
 
     @property
     def state(self) -> str:
-        try:
-            devices = ""
-            for device_id in self._mining_rig.devices:
-                devices += (
-                    self._mining_rig.get_device(device_id).name.replace("GeForce ", "")
-                    + ", "
-                )
-            return devices[:-2] if len(devices[:-2]) <= 255 else "value to long"
-        except AttributeError as error:
-            if self._enable_debug_logging:
-                _LOGGER.info(error)
-            return "unavailable"
+        devices = self._mining_rig.gpu_model_list
+        return devices if len(devices) <= 255 else "value to long"
 
 
 class GpuCountSensor(RigSensor):
@@ -547,18 +946,18 @@ class GpuCountSensor(RigSensor):
     def name(self) -> str:
         return f"{self._rig_name} GPU count"
 
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return (UPDATE_KEY_GPU_MODELS,)
+
     @property
     def unique_id(self) -> str:
         return f"{self._rig_name}_gpu_count"
 
     @property
     def state(self) -> int:
-        try:
-            return len(self._mining_rig.devices)
-        except AttributeError as error:
-            if self._enable_debug_logging:
-                _LOGGER.info(error)
-            return "unavailable"
+        return self._mining_rig.gpu_count
 
 
 class TotalPowerSensor(RigSensor):
@@ -566,32 +965,32 @@ class TotalPowerSensor(RigSensor):
 
     device_class = SensorDeviceClass.POWER
     _attr_unit_of_measurement = UnitOfPower.WATT
+    _throttle = True
+    _deadband_key = CONFIG_DEADBAND_POWER
 
     @property
     def name(self) -> str:
         return f"{self._rig_name} Power"
 
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return (UPDATE_KEY_DEVICES,)
+
     @property
     def unique_id(self) -> str:
         return f"{self._rig_name}_power"
 
     @property
     def state(self) -> float:
-        try:
-            power = 0
-            for device_id in self._mining_rig.devices:
-                power += self._mining_rig.get_device(device_id).gpu_power_usage
-            return power
-        except (AttributeError, TypeError) as error:
-            if self._enable_debug_logging:
-                _LOGGER.info(error)
-            return "unavailable"
+        return self._mining_rig.total_power
 
 
 class CPUSensor(RigSensor):
     """CPU Sensor."""
 
     _attr_unit_of_measurement = PERCENTAGE
+    _throttle = True
 
     @property
     def name(self) -> str:
@@ -615,6 +1014,7 @@ class RAMSensor(RigSensor):
     """RAM Sensor."""
 
     _attr_unit_of_measurement = PERCENTAGE
+    _throttle = True
 
     @property
     def name(self) -> str:
@@ -632,3 +1032,185 @@ class RAMSensor(RigSensor):
             if self._enable_debug_logging:
                 _LOGGER.info(error)
             return "unavailable"
+
+
+class RigEfficiencySensor(RigSensor):
+    """Rig Energy per Hash Sensor."""
+
+    _attr_unit_of_measurement = "J/Mh"
+    _throttle = True
+
+    @property
+    def name(self) -> str:
+        return f"{self._rig_name} Efficiency"
+
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return (UPDATE_KEY_EFFICIENCY,)
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._rig_name}_efficiency"
+
+    @property
+    def state(self) -> float:
+        if self._mining_rig.rig_efficiency is None:
+            return "unavailable"
+        return self._mining_rig.rig_efficiency
+
+
+class PollLatencySensor(RigSensor):
+    """Poll latency Sensor."""
+
+    device_class = SensorDeviceClass.DURATION
+    _attr_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _throttle = True
+
+    @property
+    def name(self) -> str:
+        return f"{self._rig_name} poll latency"
+
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return (UPDATE_KEY_POLL,)
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._rig_name}_poll_latency"
+
+    @property
+    def available(self) -> bool:
+        """Latency is also reported while the rig is offline."""
+        return self._mining_rig.poll_latency is not None
+
+    @property
+    def state(self) -> float:
+        return self._mining_rig.poll_latency
+
+
+class UpdateIntervalSensor(RigSensor):
+    """Current update interval Sensor."""
+
+    device_class = SensorDeviceClass.DURATION
+    _attr_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def name(self) -> str:
+        return f"{self._rig_name} update interval"
+
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return (UPDATE_KEY_MODE,)
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._rig_name}_update_interval"
+
+    @property
+    def available(self) -> bool:
+        """The interval is also reported while the rig is offline."""
+        return True
+
+    @property
+    def state(self) -> float:
+        return self._mining_rig.update_interval
+
+
+class CommandErrorsSensor(RigSensor):
+    """Failed commands Sensor, counts by error type as attributes."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def name(self) -> str:
+        return f"{self._rig_name} command errors"
+
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return (UPDATE_KEY_STATS,)
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._rig_name}_command_errors"
+
+    @property
+    def available(self) -> bool:
+        """Errors are also reported while the rig is offline."""
+        return True
+
+    @property
+    def state(self) -> int:
+        return self._mining_rig.api_stats.failure_count
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        return dict(self._mining_rig.api_stats.failures)
+
+
+class SkippedPollsSensor(RigSensor):
+    """Polls skipped because the previous one was still running."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def name(self) -> str:
+        return f"{self._rig_name} skipped polls"
+
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return (UPDATE_KEY_STATS,)
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._rig_name}_skipped_polls"
+
+    @property
+    def available(self) -> bool:
+        """Skipped polls are also reported while the rig is offline."""
+        return True
+
+    @property
+    def state(self) -> int:
+        return self._mining_rig.skipped_polls
+
+
+class FanoutTimeSensor(RigSensor):
+    """Time to call the entity callbacks of the last poll.
+
+    Written in a second step after the fan-out, its own write is not part of
+    the time.
+    """
+
+    device_class = SensorDeviceClass.DURATION
+    _attr_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _throttle = True
+
+    @property
+    def name(self) -> str:
+        return f"{self._rig_name} callback fan-out"
+
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return (UPDATE_KEY_FANOUT,)
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._rig_name}_fanout_time"
+
+    @property
+    def available(self) -> bool:
+        """Fan-out time is also reported while the rig is offline."""
+        return self._mining_rig.fanout_time is not None
+
+    @property
+    def state(self) -> float:
+        return self._mining_rig.fanout_time
@@ -0,0 +1,124 @@
+"""Services of the Nicehash Excavator integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+
+from .const import ALGORITHM_NONE, DOMAIN
+from .mining_rig import MiningRig
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_SET_ALGORITHM = "set_algorithm"
+ATTR_ALGORITHM = "algorithm"
+
+SET_ALGORITHM_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ALGORITHM): cv.string,
+        **cv.TARGET_SERVICE_FIELDS,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def async_set_algorithm(call: ServiceCall) -> ServiceResponse:
+        """Set the algorithm of the targeted GPUs and rigs."""
+        algorithm = call.data[ATTR_ALGORITHM]
+        targets = _async_target_devices(hass, call)
+        if not targets:
+            raise ServiceValidationError("No Nicehash Excavator GPU or rig targeted")
+
+        async def set_device(mining_rig: MiningRig, device_uuid: str) -> dict:
+            success = await mining_rig.set_device_algorithm(device_uuid, algorithm)
+            if not success:
+                _LOGGER.warning(
+                    "Failed to set algorithm %s on %s of %s",
+                    algorithm,
+                    device_uuid,
+                    mining_rig.name,
+                )
+            return {"rig": mining_rig.name, "device": device_uuid, "success": success}
+
+        # the commands of all rigs share the request limit of the scheduler
+        results = await asyncio.gather(
+            *(
+                set_device(mining_rig, device_uuid)
+                for mining_rig, device_uuids in targets.items()
+                for device_uuid in device_uuids
+            )
+        )
+        await asyncio.gather(
+            *(_async_refresh(mining_rig, algorithm) for mining_rig in targets)
+        )
+        return {"devices": results}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_ALGORITHM,
+        async_set_algorithm,
+        schema=SET_ALGORITHM_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def _async_refresh(mining_rig: MiningRig, algorithm: str) -> None:
+    """Update a rig once after its workers changed."""
+    await mining_rig.update()
+    if algorithm != ALGORITHM_NONE and mining_rig.get_algorithm_id(algorithm) is None:
+        await mining_rig.add_algorith(algorithm)
+
+
+@callback
+def _async_target_devices(
+    hass: HomeAssistant, call: ServiceCall
+) -> dict[MiningRig, set[str]]:
+    """GPU uuids of the targeted devices by rig, a rig device targets all GPUs."""
+    selected = async_extract_referenced_entity_ids(hass, call)
+    device_ids = set(selected.referenced_devices)
+    entity_registry = er.async_get(hass)
+    for entity_id in selected.referenced:
+        entry = entity_registry.async_get(entity_id)
+        if entry is not None and entry.device_id is not None:
+            device_ids.add(entry.device_id)
+
+    device_registry = dr.async_get(hass)
+    domain_data = hass.data.get(DOMAIN, {})
+    targets: dict[MiningRig, set[str]] = {}
+    for device_id in device_ids:
+        device = device_registry.async_get(device_id)
+        if device is None:
+            continue
+        for entry_id in device.config_entries:
+            # hass.data also holds the scheduler
+            mining_rig = domain_data.get(entry_id)
+            if not isinstance(mining_rig, MiningRig):
+                continue
+            device_uuids = {card.uuid for card in mining_rig.devices.values()}
+            if (DOMAIN, f"{mining_rig.name} Excavator") not in device.identifiers:
+                device_uuids &= {
+                    identifier
+                    for domain, identifier in device.identifiers
+                    if domain == DOMAIN
+                }
+            if device_uuids:
+                targets.setdefault(mining_rig, set()).update(device_uuids)
+    return targets
@@ -8,11 +8,11 @@ from homeassistant.core import HomeAssistant
 
 from .const import (
     CONFIG_NAME,
-    CONFIG_UPDATE_INTERVAL,
-    CONFIG_UPDATE_INTERVAL_FAST,
     DOMAIN,
+    UPDATE_MODE_FAST,
+    UPDATE_MODE_SLOW,
 )
-from .mining_rig import MiningRig
+from .mining_rig import UPDATE_KEY_MODE, MiningRig
 from .sensor import RigSensor
 
 
@@ -38,7 +38,11 @@ class RequestRateSwitch(RigSensor, SwitchEntity):
         super().__init__(mining_rig, config_entry)
         self._hass = hass
         self._config_entry = config_entry
-        self._state = False
+
+    @property
+    def update_keys(self) -> tuple:
+        """Keys of the MiningRig data this entity depends on."""
+        return (UPDATE_KEY_MODE,)
 
     @property
     def unique_id(self) -> str:
@@ -52,16 +56,12 @@ class RequestRateSwitch(RigSensor, SwitchEntity):
     @property
     def is_on(self):
         """Return true if device is on."""
-        return self._state
+        return self._mining_rig.update_mode == UPDATE_MODE_FAST
 
     async def async_turn_on(self, **args):
         """Turn the device on."""
-        update_interval = self._config_entry.data.get(CONFIG_UPDATE_INTERVAL_FAST)
-        self._mining_rig.set_update_interval(self._hass, update_interval)
-        self._state = True
+        self._mining_rig.set_update_mode(UPDATE_MODE_FAST)
 
     async def async_turn_off(self, **args):
         """Turn the device off."""
-        update_interval = self._config_entry.data.get(CONFIG_UPDATE_INTERVAL)
-        self._mining_rig.set_update_interval(self._hass, update_interval)
-        self._state = False
+        self._mining_rig.set_update_mode(UPDATE_MODE_SLOW)
@@ -0,0 +1,565 @@
+"""Fake Excavator API servers and a poll benchmark for development.
+
+Serve 50 fake rigs with 12 GPUs each, http on ports 18000-18049 and the
+TCP JSON-RPC API on 19000-19049:
+
+    python scripts/fake_excavator.py --rigs 50 --devices 12
+
+Poll the running fake rigs every second for a minute like the integration
+does and report latency, CPU time and memory:
+
+    python scripts/fake_excavator.py --rigs 50 --bench 60 --transport tcp
+
+Send devices.get commands back to back to the running fake rigs for 10 s,
+once with a new session per command and once with the pooled session, and
+report the requests per second and latency of both:
+
+    python scripts/fake_excavator.py --rigs 10 --throughput 10
+
+Measure the encode and decode cost of one poll of a rig with 12 GPUs:
+
+    python scripts/fake_excavator.py --devices 12 --codec 10000
+
+Measure the cost and memory of merging 1000 polls into the data containers
+in place, compared to rebuilding them every poll:
+
+    python scripts/fake_excavator.py --devices 12 --parse 1000
+
+The rigs can also be added to the Home Assistant dev instance of the
+devcontainer to measure the whole integration.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import importlib
+import json
+import random
+import statistics
+import sys
+import time
+import timeit
+import tracemalloc
+import types
+from collections.abc import Callable
+from pathlib import Path
+
+from aiohttp import web
+
+ALGORITHMS = [
+    "daggerhashimoto",
+    "kawpow",
+    "autolykos",
+    "etchash",
+    "octopus",
+    "beamv3",
+    "cuckoocycle",
+    "zelhash",
+    "zhash",
+    "randomxmonero",
+    "kheavyhash",
+    "nexapow",
+    "alephium",
+    "fishhash",
+    "karlsenhash",
+]
+
+
+INTEGRATION_PATH = (
+    Path(__file__).resolve().parent.parent / "custom_components" / "nicehash_excavator"
+)
+
+
+def _integration_module(name: str) -> types.ModuleType:
+    """Import a module of the integration without its package __init__.
+
+    The __init__ sets up Home Assistant, the transport and data containers
+    only need aiohttp and orjson.
+    """
+    if "nicehash_excavator" not in sys.modules:
+        package = types.ModuleType("nicehash_excavator")
+        package.__path__ = [str(INTEGRATION_PATH)]
+        sys.modules["nicehash_excavator"] = package
+    return importlib.import_module(f"nicehash_excavator.{name}")
+
+
+class FakeRig:
+    """Excavator state of one rig, the values drift on every request."""
+
+    def __init__(self, args: argparse.Namespace, index: int) -> None:
+        """Init FakeRig."""
+        self._args = args
+        self._random = random.Random(index)
+        self.started = time.time()
+        self.algorithms = ALGORITHMS[: args.algorithms]
+        self.devices = [
+            {
+                "device_id": device_id,
+                "name": "NVIDIA GeForce RTX 3080",
+                "subvendor": "1462",
+                "uuid": f"GPU-{index:04d}-{device_id:04d}",
+                "gpu_temp": 60,
+                "gpu_load": 100,
+                "gpu_load_memctrl": 80,
+                "gpu_power_usage": 220.0,
+                "gpu_fan_speed": 70,
+                "too_hot": False,
+                "__vram_temp": 80,
+                "__hotspot_temp": 72,
+            }
+            for device_id in range(args.devices)
+        ]
+        # every device mines one of the algorithms
+        self.workers = {
+            device["device_id"]: device["device_id"] % len(self.algorithms)
+            for device in self.devices
+        }
+
+    def _drift(self) -> None:
+        """Move the telemetry by a small random step."""
+        for device in self.devices:
+            for key in ("gpu_temp", "__vram_temp", "__hotspot_temp", "gpu_fan_speed"):
+                device[key] = max(
+                    30, min(100, device[key] + self._random.randint(-1, 1))
+                )
+            device["gpu_power_usage"] = round(
+                max(50.0, device["gpu_power_usage"] + self._random.uniform(-3, 3)), 1
+            )
+            device["too_hot"] = device["gpu_temp"] >= 90
+
+    def _device_id(self, device: str) -> int | None:
+        """Id of a device given by id or UUID like worker.add accepts."""
+        for data in self.devices:
+            if device in (str(data["device_id"]), data["uuid"]):
+                return data["device_id"]
+        return None
+
+    def handle(self, query: dict) -> dict:
+        """Answer one JSON-RPC query."""
+        method = query.get("method")
+        params = query.get("params") or []
+        response = {"id": query.get("id"), "error": None}
+        if method == "info":
+            response.update(
+                version="1.8.1.0",
+                build_platform="Linux",
+                build_number=1,
+                excavator_cuda_ver=12000,
+                driver_cuda_ver=12020,
+                uptime=int(time.time() - self.started),
+                cpu_load=round(self._random.uniform(1, 10), 1),
+                ram_load=round(self._random.uniform(20, 40), 1),
+            )
+        elif method == "devices.get":
+            self._drift()
+            response["devices"] = self.devices
+        elif method == "algorithm.list":
+            response["algorithms"] = [
+                {"algorithm_id": algorithm_id, "name": name, "speed": 0}
+                for algorithm_id, name in enumerate(self.algorithms)
+            ]
+        elif method == "worker.list":
+            response["workers"] = [
+                {
+                    "worker_id": device_id,
+                    "device_id": device_id,
+                    "device_uuid": self.devices[device_id]["uuid"],
+                    "algorithms": [
+                        {
+                            "id": algorithm_id,
+                            "name": self.algorithms[algorithm_id],
+                            "speed": self._random.uniform(95e6, 100e6),
+                        }
+                    ],
+                }
+                for device_id, algorithm_id in self.workers.items()
+            ]
+        elif method == "worker.add" and len(params) == 2:
+            device_id = self._device_id(params[1])
+            if params[0] not in self.algorithms:
+                response["error"] = "Algorithm not found"
+            elif device_id is None:
+                response["error"] = "Device not found"
+            else:
+                self.workers[device_id] = self.algorithms.index(params[0])
+        elif method == "worker.free" and params:
+            if self.workers.pop(int(params[0]), None) is None:
+                response["error"] = "Worker not found"
+        elif method == "algorithm.add" and params:
+            if params[0] not in self.algorithms:
+                self.algorithms.append(params[0])
+        else:
+            response["error"] = "Invalid method"
+        return response
+
+    async def answer(self, query: dict) -> dict | None:
+        """Answer after the latency, None for a failed request."""
+        delay = self._args.latency + self._random.uniform(0, self._args.jitter)
+        await asyncio.sleep(delay / 1000)
+        if self._random.random() < self._args.failure_rate:
+            return None
+        try:
+            return self.handle(query)
+        except (TypeError, ValueError) as err:
+            # answer like Excavator instead of dropping the connection
+            return {"id": query.get("id"), "error": f"Invalid params: {err}"}
+
+
+async def start_http(rig: FakeRig, host: str, port: int) -> web.AppRunner:
+    """Serve the watchdog http API of a rig."""
+
+    async def api(request: web.Request) -> web.Response:
+        try:
+            query = json.loads(request.query["command"])
+        except (KeyError, ValueError):
+            return web.Response(status=400)
+        response = await rig.answer(query)
+        if response is None:
+            return web.Response(status=500)
+        return web.json_response(response)
+
+    app = web.Application()
+    app.router.add_get("/api", api)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+async def start_tcp(rig: FakeRig, host: str, port: int) -> asyncio.Server:
+    """Serve the TCP JSON-RPC API of a rig, a failure drops the connection."""
+
+    async def connection(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        async def reply(query: dict) -> None:
+            response = await rig.answer(query)
+            if response is None:
+                writer.close()
+                return
+            if not writer.is_closing():
+                writer.write(json.dumps(response).encode() + b"\n")
+
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                try:
+                    query = json.loads(line)
+                except ValueError:
+                    continue
+                task = asyncio.create_task(reply(query))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except OSError:
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(connection, host, port)
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Serve the fake rigs until interrupted."""
+    for index in range(args.rigs):
+        rig = FakeRig(args, index)
+        await start_http(rig, args.host, args.port + index)
+        await start_tcp(rig, args.host, args.port + args.tcp_offset + index)
+    print(
+        f"{args.rigs} rigs with {args.devices} GPUs: http ports {args.port}"
+        f"-{args.port + args.rigs - 1}, tcp ports {args.port + args.tcp_offset}"
+        f"-{args.port + args.tcp_offset + args.rigs - 1}"
+    )
+    await asyncio.Event().wait()
+
+
+def _percentiles(latencies: list[float]) -> str:
+    """Median, p95, p99 and max of the latencies."""
+    if len(latencies) < 2:
+        return "too few requests"
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return (
+        f"median {statistics.median(latencies):.1f}, p95 {quantiles[94]:.1f}, "
+        f"p99 {quantiles[98]:.1f}, max {max(latencies):.1f}"
+    )
+
+
+async def bench(args: argparse.Namespace) -> None:
+    """Poll the running fake rigs with ExcavatorAPI and report the costs."""
+    ExcavatorAPI = _integration_module("excavator").ExcavatorAPI
+
+    offset = args.tcp_offset if args.transport == "tcp" else 0
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    apis = [
+        ExcavatorAPI(args.host, args.port + offset + index, transport=args.transport)
+        for index in range(args.rigs)
+    ]
+    latencies: list[float] = []
+    failures = 0
+
+    async def poll(api: ExcavatorAPI) -> None:
+        nonlocal failures
+        start = time.perf_counter()
+        responses = await api.get_rig_data()
+        latencies.append((time.perf_counter() - start) * 1000)
+        failures += sum(response is None for response in responses)
+
+    async def poll_rig(index: int, end: float) -> None:
+        # spread the rigs over the interval like the scheduler
+        await asyncio.sleep(args.interval * index / args.rigs)
+        while time.monotonic() < end:
+            next_poll = time.monotonic() + args.interval
+            await poll(apis[index])
+            await asyncio.sleep(max(0, next_poll - time.monotonic()))
+
+    cpu_start = time.process_time()
+    end = time.monotonic() + args.bench
+    await asyncio.gather(*(poll_rig(index, end) for index in range(args.rigs)))
+    cpu = time.process_time() - cpu_start
+    memory = tracemalloc.get_traced_memory()[0] - memory_before
+    for api in apis:
+        await api.close()
+
+    print(f"polls: {len(latencies)}, failed commands: {failures}")
+    print(f"latency ms: {_percentiles(latencies)}")
+    print(f"CPU ms per poll: {cpu * 1000 / len(latencies):.3f}")
+    print(f"memory KiB per rig: {memory / 1024 / args.rigs:.1f}")
+
+
+async def _send_back_to_back(
+    transport, command, end: float, latencies: list[float]
+) -> int:
+    """Send the command until the end, add the latencies, return the failures."""
+    failures = 0
+    request_id = 0
+    while time.monotonic() < end:
+        request_id += 1
+        start = time.perf_counter()
+        (response,) = await transport.send([(request_id, command)])
+        if isinstance(response, BaseException):
+            failures += 1
+        else:
+            latencies.append((time.perf_counter() - start) * 1000)
+    return failures
+
+
+async def throughput(args: argparse.Namespace) -> None:
+    """Compare a session per command to the pooled session of the transport."""
+    import aiohttp
+
+    excavator = _integration_module("excavator")
+    HttpTransport = excavator.HttpTransport
+    ApiStats = _integration_module("instrumentation").ApiStats
+
+    class SessionPerCommand(HttpTransport):
+        """Opens and closes a session for every command, without keep-alive."""
+
+        async def request(self, query: tuple) -> dict:
+            async with aiohttp.ClientSession() as session:
+                # taken by the request before it awaits
+                self._session, self._owns_session = session, False
+                return await super().request(query)
+
+    for name, transport_type in (
+        ("session per command", SessionPerCommand),
+        ("pooled session", HttpTransport),
+    ):
+        transports = [
+            transport_type(
+                "http://" + args.host, args.port + index, "", False, 5, 5, ApiStats()
+            )
+            for index in range(args.rigs)
+        ]
+        latencies: list[float] = []
+        end = time.monotonic() + args.throughput
+        failures = sum(
+            await asyncio.gather(
+                *(
+                    _send_back_to_back(
+                        transport, excavator.COMMAND_DEVICES_GET, end, latencies
+                    )
+                    for transport in transports
+                )
+            )
+        )
+        for transport in transports:
+            await transport.close()
+        print(
+            f"{name}: requests/s {len(latencies) / args.throughput:.0f}, "
+            f"failed {failures}, latency ms: {_percentiles(latencies)}"
+        )
+
+
+def codec(args: argparse.Namespace) -> None:
+    """Time the encoding of the poll commands and decoding of their responses."""
+    import orjson
+
+    excavator = _integration_module("excavator")
+    ApiStats = _integration_module("instrumentation").ApiStats
+
+    commands = [
+        excavator.COMMAND_DEVICES_GET,
+        excavator.COMMAND_WORKER_LIST,
+        excavator.COMMAND_INFO,
+        excavator.COMMAND_ALGORITHM_LIST,
+    ]
+    rig = FakeRig(args, 0)
+    bodies = [
+        json.dumps(rig.handle({"id": index, "method": command.method})).encode()
+        for index, command in enumerate(commands)
+    ]
+    transport = excavator.HttpTransport(
+        "http://" + args.host, args.port, "", False, 1, 1, ApiStats()
+    )
+
+    def encode() -> None:
+        for index, command in enumerate(commands):
+            transport._command_url(index, command)
+
+    def decode() -> None:
+        for body in bodies:
+            orjson.loads(body)
+
+    def decode_json() -> None:
+        for body in bodies:
+            json.loads(body)
+
+    print(f"response bytes per poll: {sum(len(body) for body in bodies)}")
+    for name, function in (
+        ("encode", encode),
+        ("decode orjson", decode),
+        ("decode json", decode_json),
+    ):
+        seconds = timeit.timeit(function, number=args.codec)
+        print(f"{name} us per poll: {seconds * 1e6 / args.codec:.2f}")
+
+
+def parse(args: argparse.Namespace) -> None:
+    """Time and trace merging decoded polls into the data containers."""
+    import orjson
+
+    containers = _integration_module("data_containers")
+    Algorithm = containers.Algorithm
+    GraphicsCard = containers.GraphicsCard
+    RigInfo = containers.RigInfo
+    Worker = containers.Worker
+    update_items = containers.update_items
+
+    rig = FakeRig(args, 0)
+
+    def response(method: str) -> dict:
+        # decoded like the API, the fake reuses its own dicts
+        return orjson.loads(orjson.dumps(rig.handle({"id": 0, "method": method})))
+
+    # distinct telemetry per poll, cycled when timing more polls
+    polls = [
+        (
+            response("info"),
+            response("devices.get")["devices"],
+            response("algorithm.list")["algorithms"],
+            response("worker.list")["workers"],
+        )
+        for _ in range(min(args.parse, 100))
+    ]
+    info = RigInfo()
+    devices: dict = {}
+    algorithms: dict = {}
+    workers: dict = {}
+
+    def in_place(index: int) -> None:
+        info_data, devices_data, algorithms_data, workers_data = polls[index]
+        info.update_from(info_data)
+        update_items(devices, devices_data, GraphicsCard)
+        update_items(algorithms, algorithms_data, Algorithm)
+        update_items(workers, workers_data, Worker)
+
+    def rebuild(index: int) -> tuple:
+        info_data, devices_data, algorithms_data, workers_data = polls[index]
+        return (
+            RigInfo.from_data(info_data),
+            {GraphicsCard.id_from(d): GraphicsCard.from_data(d) for d in devices_data},
+            {Algorithm.id_from(d): Algorithm.from_data(d) for d in algorithms_data},
+            {Worker.id_from(d): Worker.from_data(d) for d in workers_data},
+        )
+
+    def run(function: Callable[[int], tuple | None]) -> tuple | None:
+        kept = None
+        for index in range(args.parse):
+            kept = function(index % len(polls))
+        return kept
+
+    print(f"{args.devices} GPUs, {args.parse} polls")
+    for name, function in (("in place", in_place), ("rebuilt", rebuild)):
+        # the first poll creates the containers, it is not measured
+        function(0)
+        seconds = min(
+            timeit.repeat(functools.partial(run, function), number=1, repeat=5)
+        )
+        tracemalloc.start()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        kept = run(function)
+        memory, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del kept
+        # peak: allocated at once while polling, kept: new memory after it
+        print(
+            f"{name}: ms per 1000 polls {seconds * 1e6 / args.parse:.1f}, "
+            f"peak KiB {(peak - memory_before) / 1024:.1f}, "
+            f"kept KiB {(memory - memory_before) / 1024:.1f}"
+        )
+
+
+def main() -> None:
+    """Parse the arguments and serve or bench."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18000, help="first http port")
+    parser.add_argument(
+        "--tcp-offset", type=int, default=1000, help="tcp port minus http port"
+    )
+    parser.add_argument("--rigs", type=int, default=1)
+    parser.add_argument("--devices", type=int, default=12, help="GPUs per rig")
+    parser.add_argument(
+        "--algorithms", type=int, default=15, help=f"up to {len(ALGORITHMS)}"
+    )
+    parser.add_argument("--latency", type=float, default=0, help="ms per request")
+    parser.add_argument("--jitter", type=float, default=0, help="random extra ms")
+    parser.add_argument(
+        "--failure-rate", type=float, default=0, help="0 to 1 of failed requests"
+    )
+    parser.add_argument(
+        "--bench", type=float, default=0, help="poll the rigs for seconds"
+    )
+    parser.add_argument("--interval", type=float, default=1, help="bench interval")
+    parser.add_argument(
+        "--throughput", type=float, default=0, help="send http commands for seconds"
+    )
+    parser.add_argument("--transport", choices=["http", "tcp"], default="http")
+    parser.add_argument(
+        "--codec", type=int, default=0, help="time encode/decode for iterations"
+    )
+    parser.add_argument(
+        "--parse", type=int, default=0, help="time the data containers for polls"
+    )
+    args = parser.parse_args()
+    args.algorithms = max(1, min(args.algorithms, len(ALGORITHMS)))
+
+    if args.codec:
+        codec(args)
+        return
+    if args.parse:
+        parse(args)
+        return
+    if args.throughput:
+        asyncio.run(throughput(args))
+        return
+    try:
+        asyncio.run(bench(args) if args.bench else serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Fixtures for the Nicehash Excavator tests."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import orjson
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.nicehash_excavator.const import (
+    CONFIG_AUTH_TOKEN,
+    CONFIG_ENABLE_DEBUG_LOGGING,
+    CONFIG_HOST_ADDRESS,
+    CONFIG_HOST_PORT,
+    CONFIG_NAME,
+    CONFIG_TRANSPORT,
+    CONFIG_UPDATE_INTERVAL,
+    CONFIG_UPDATE_INTERVAL_FAST,
+    CONFIG_UPDATE_MODE,
+    DOMAIN,
+    MAX_UPDATE_INTERVAL,
+    TRANSPORT_HTTP,
+    UPDATE_MODE_SLOW,
+)
+from custom_components.nicehash_excavator.excavator import (
+    ExcavatorAPI,
+    ExcavatorTransport,
+    Query,
+)
+
+# the fake rigs of the dev script answer the commands
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from fake_excavator import FakeRig  # noqa: E402
+
+FIRST_PORT = 18000
+
+
+class FakeTransport(ExcavatorTransport):
+    """Answers the commands with a FakeRig, encoded and decoded like the API."""
+
+    def __init__(self, rig: FakeRig) -> None:
+        """Init FakeTransport."""
+        self.rig = rig
+
+    async def send(self, queries: list[Query]) -> list[dict]:
+        """Answer all commands."""
+        return [
+            orjson.loads(
+                orjson.dumps(
+                    self.rig.handle(
+                        {
+                            "id": request_id,
+                            "method": command.method,
+                            "params": list(command.params),
+                        }
+                    )
+                )
+            )
+            for request_id, command in queries
+        ]
+
+
+def fake_rig_args(devices: int = 12, algorithms: int = 15) -> argparse.Namespace:
+    """Arguments of a FakeRig without latency and failures."""
+    return argparse.Namespace(
+        devices=devices, algorithms=algorithms, latency=0, jitter=0, failure_rate=0
+    )
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components."""
+    return
+
+
+@pytest.fixture
+def fake_rigs():
+    """FakeRigs by port, the APIs of the config entries talk to them."""
+    rigs: dict[int, FakeRig] = {}
+    args = fake_rig_args()
+
+    def create_transport(api: ExcavatorAPI) -> FakeTransport:
+        port = api._host_port
+        if port not in rigs:
+            rigs[port] = FakeRig(args, port - FIRST_PORT)
+        return FakeTransport(rigs[port])
+
+    with patch.object(
+        ExcavatorAPI, "_create_transport", autospec=True, side_effect=create_transport
+    ):
+        yield rigs
+
+
+async def async_setup_rigs(
+    hass: HomeAssistant,
+    count: int,
+    update_interval: int = MAX_UPDATE_INTERVAL,
+    data: dict | None = None,
+) -> list[MockConfigEntry]:
+    """Set up config entries of fake rigs, data is added to their config.
+
+    With the default interval the rigs are only polled when the test updates.
+    """
+    entries = []
+    for index in range(count):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=f"rig{index}",
+            data={
+                CONFIG_NAME: f"rig{index}",
+                CONFIG_HOST_ADDRESS: "127.0.0.1",
+                CONFIG_HOST_PORT: FIRST_PORT + index,
+                CONFIG_AUTH_TOKEN: "",
+                CONFIG_TRANSPORT: TRANSPORT_HTTP,
+                CONFIG_UPDATE_INTERVAL: update_interval,
+                CONFIG_UPDATE_INTERVAL_FAST: update_interval,
+                CONFIG_UPDATE_MODE: UPDATE_MODE_SLOW,
+                CONFIG_ENABLE_DEBUG_LOGGING: False,
+                **(data or {}),
+            },
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    return entries
@@ -0,0 +1,111 @@
+"""Benchmarks of fake rigs polled by the PollScheduler at a 1 s interval.
+
+Run with -s to see the costs:
+
+    pytest tests/test_benchmark.py -s
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+import tracemalloc
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
+
+from custom_components.nicehash_excavator.const import DOMAIN, MIN_UPDATE_INTERVAL
+from custom_components.nicehash_excavator.mining_rig import MiningRig
+
+from .conftest import async_setup_rigs
+
+RIGS = 50
+# polls of every rig before the measurement
+WARMUP_SECONDS = 2
+SECONDS = 5
+# 12 GPUs with drifting telemetry, the throttle is off
+MAX_WRITES_PER_POLL = 175
+MAX_KIB_PER_RIG = 4096
+
+
+async def _async_setup_polled_rigs(hass: HomeAssistant) -> list[MiningRig]:
+    """Set up the rigs at the minimum interval and let them poll a while."""
+    entries = await async_setup_rigs(hass, RIGS, MIN_UPDATE_INTERVAL)
+    await asyncio.sleep(WARMUP_SECONDS)
+    await hass.async_block_till_done()
+    return [hass.data[DOMAIN][entry.entry_id] for entry in entries]
+
+
+async def _async_unload_rigs(hass: HomeAssistant) -> None:
+    """Unload the rigs, which stops the scheduler."""
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_poll_cost(hass: HomeAssistant, fake_rigs) -> None:
+    """Latency, state writes and CPU time of the scheduled polls."""
+    mining_rigs = await _async_setup_polled_rigs(hass)
+    entity_count = len(hass.states.async_all())
+    skipped_before = sum(mining_rig.skipped_polls for mining_rig in mining_rigs)
+
+    update = MiningRig.update
+    latencies = []
+
+    async def timed_update(mining_rig: MiningRig) -> None:
+        start = time.perf_counter()
+        await update(mining_rig)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    write_ha_state = Entity.async_write_ha_state
+    with (
+        patch.object(MiningRig, "update", timed_update),
+        patch.object(
+            Entity, "async_write_ha_state", autospec=True, side_effect=write_ha_state
+        ) as mock_write,
+    ):
+        cpu_start = time.process_time()
+        await asyncio.sleep(SECONDS)
+        await hass.async_block_till_done()
+        cpu = time.process_time() - cpu_start
+    polls = len(latencies)
+    writes_per_poll = mock_write.call_count / polls
+    skipped = sum(mining_rig.skipped_polls for mining_rig in mining_rigs)
+
+    print(
+        f"\n{RIGS} rigs with 12 GPUs, {entity_count} entities, {polls} polls "
+        f"in {SECONDS} s"
+        f"\nupdate latency ms: median {statistics.median(latencies):.2f}, "
+        f"max {max(latencies):.2f}"
+        f"\nstate writes per poll: {writes_per_poll:.1f}"
+        f"\nCPU ms per poll: {cpu * 1000 / polls:.3f}, "
+        f"CPU load {cpu / SECONDS:.0%}"
+        f"\nskipped polls: {skipped - skipped_before}"
+    )
+    assert all(mining_rig.online for mining_rig in mining_rigs)
+    # every rig polled each second, none overlapped its previous poll
+    assert polls >= RIGS * (SECONDS - 1)
+    assert skipped == skipped_before
+    assert 0 < writes_per_poll <= MAX_WRITES_PER_POLL
+
+    await _async_unload_rigs(hass)
+
+
+async def test_memory_per_rig(hass: HomeAssistant, fake_rigs) -> None:
+    """Memory of a set up and polled rig with its entities."""
+    tracemalloc.start()
+    try:
+        memory_before = tracemalloc.get_traced_memory()[0]
+        mining_rigs = await _async_setup_polled_rigs(hass)
+        memory = tracemalloc.get_traced_memory()[0] - memory_before
+    finally:
+        tracemalloc.stop()
+
+    kib_per_rig = memory / 1024 / RIGS
+    print(f"\nmemory KiB per rig: {kib_per_rig:.1f}")
+    assert all(mining_rig.online for mining_rig in mining_rigs)
+    assert kib_per_rig <= MAX_KIB_PER_RIG
+
+    await _async_unload_rigs(hass)
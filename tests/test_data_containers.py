@@ -0,0 +1,53 @@
+"""Tests of merging the API data into the data containers."""
+
+from __future__ import annotations
+
+from custom_components.nicehash_excavator.data_containers import (
+    GraphicsCard,
+    update_items,
+)
+
+
+def _device(device_id: int, **values) -> dict:
+    """API data of a GPU."""
+    return {
+        "device_id": device_id,
+        "uuid": f"GPU-{device_id}",
+        "gpu_temp": 60,
+        "gpu_fan_speed": 70,
+        **values,
+    }
+
+
+def test_update_items() -> None:
+    """Added, changed and removed items are returned, unchanged ones are not."""
+    devices: dict[int, GraphicsCard] = {}
+    assert update_items(devices, [_device(0), _device(1)], GraphicsCard) == {0, 1}
+    first = devices[0]
+
+    changed_fields: dict[int, list[str]] = {}
+    changed = update_items(
+        devices,
+        [_device(0, gpu_temp=61, gpu_fan_speed=72), _device(1), _device(2)],
+        GraphicsCard,
+        changed_fields,
+    )
+    assert changed == {0, 2}
+    # the added item has no changed fields
+    assert changed_fields == {0: ["gpu_temp", "gpu_fan_speed"]}
+    # updated in place
+    assert devices[0] is first
+    assert first.gpu_temp == 61
+
+    changed_fields.clear()
+    assert update_items(
+        devices,
+        [_device(0, gpu_temp=61, gpu_fan_speed=72)],
+        GraphicsCard,
+        changed_fields,
+    ) == {1, 2}
+    assert list(devices) == [0]
+    assert changed_fields == {}
+
+    assert update_items(devices, None, GraphicsCard) == {0}
+    assert devices == {}
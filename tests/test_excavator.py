@@ -0,0 +1,155 @@
+"""Tests of the circuit breaker and the TCP transport of the Excavator API."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+from custom_components.nicehash_excavator.const import (
+    CIRCUIT_BREAKER_PROBE_INTERVAL,
+    CIRCUIT_BREAKER_THRESHOLD,
+    MAX_BACKOFF_INTERVAL,
+    TCP_READ_LIMIT,
+)
+from custom_components.nicehash_excavator.excavator import (
+    COMMAND_INFO,
+    CircuitBreaker,
+    TcpTransport,
+)
+from custom_components.nicehash_excavator.instrumentation import ApiStats
+
+
+class FakeClock:
+    """Monotonic time of the excavator module, moved by the test."""
+
+    def __init__(self) -> None:
+        """Init FakeClock."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Return the time."""
+        return self.now
+
+
+def _open_breaker(breaker: CircuitBreaker) -> None:
+    """Fail up to the threshold."""
+    for _ in range(CIRCUIT_BREAKER_THRESHOLD):
+        breaker.record_failure()
+
+
+def test_circuit_breaker_transitions() -> None:
+    """The breaker opens at the threshold, probes half open and closes again."""
+    clock = FakeClock()
+    breaker = CircuitBreaker()
+    with patch("custom_components.nicehash_excavator.excavator.time.monotonic", clock):
+        for _ in range(CIRCUIT_BREAKER_THRESHOLD - 1):
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.STATE_CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.STATE_OPEN
+        assert not breaker.is_closed
+        assert not breaker.try_probe()
+
+        clock.now += CIRCUIT_BREAKER_PROBE_INTERVAL
+        assert breaker.try_probe()
+        assert breaker.state == CircuitBreaker.STATE_HALF_OPEN
+        # one probe at a time
+        assert not breaker.try_probe()
+
+        breaker.record_success()
+        assert breaker.is_closed
+        assert breaker.failures == 0
+
+
+def test_probe_backoff() -> None:
+    """Every failed probe doubles the interval up to the maximum backoff."""
+    clock = FakeClock()
+    breaker = CircuitBreaker()
+    with patch("custom_components.nicehash_excavator.excavator.time.monotonic", clock):
+        _open_breaker(breaker)
+        expected = CIRCUIT_BREAKER_PROBE_INTERVAL
+        intervals = []
+        while len(intervals) < 10:
+            clock.now += expected - 0.1
+            assert not breaker.try_probe()
+            clock.now += 0.1
+            assert breaker.try_probe()
+            breaker.record_failure()
+            assert breaker.state == CircuitBreaker.STATE_OPEN
+            expected = min(expected * 2, MAX_BACKOFF_INTERVAL)
+            intervals.append(expected)
+        assert intervals[:3] == [
+            CIRCUIT_BREAKER_PROBE_INTERVAL * 2,
+            CIRCUIT_BREAKER_PROBE_INTERVAL * 4,
+            CIRCUIT_BREAKER_PROBE_INTERVAL * 8,
+        ]
+        assert intervals[-1] == MAX_BACKOFF_INTERVAL
+
+        # a success resets the interval
+        clock.now += MAX_BACKOFF_INTERVAL
+        assert breaker.try_probe()
+        breaker.record_success()
+        _open_breaker(breaker)
+        clock.now += CIRCUIT_BREAKER_PROBE_INTERVAL
+        assert breaker.try_probe()
+
+
+async def _async_start_server(handle_line) -> tuple[asyncio.Server, int]:
+    """TCP server calling handle_line(line, writer) for every line received."""
+
+    async def handle_connection(reader, writer) -> None:
+        while line := await reader.readline():
+            await handle_line(line, writer)
+        writer.close()
+
+    server = await asyncio.start_server(handle_connection, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+async def test_tcp_reconnect(socket_enabled) -> None:
+    """A dropped connection fails its commands and is opened again."""
+    connections = []
+
+    async def answer_once(line: bytes, writer: asyncio.StreamWriter) -> None:
+        connections.append(writer)
+        request_id = line.split(b'"id":')[1].rstrip(b"}\n")
+        if request_id != b"3":
+            writer.write(b'{"id":' + request_id + b',"error":null}\n')
+            await writer.drain()
+        writer.close()
+
+    server, port = await _async_start_server(answer_once)
+    transport = TcpTransport("127.0.0.1", port, False, 5, 5, ApiStats())
+    try:
+        assert await transport.send([(1, COMMAND_INFO)]) == [{"id": 1, "error": None}]
+        # the server closed the connection after the answer
+        await asyncio.sleep(0.05)
+        assert await transport.send([(2, COMMAND_INFO)]) == [{"id": 2, "error": None}]
+        [result] = await transport.send([(3, COMMAND_INFO)])
+        assert isinstance(result, ConnectionError)
+        assert len(connections) == 3
+    finally:
+        await transport.close()
+        server.close()
+        await server.wait_closed()
+
+
+async def test_tcp_line_limit(socket_enabled) -> None:
+    """A response over the read limit fails at once and drops the connection."""
+
+    async def answer_too_long(line: bytes, writer: asyncio.StreamWriter) -> None:
+        writer.write(b'{"id":1,"x":"' + b"a" * TCP_READ_LIMIT + b'"}\n')
+        await writer.drain()
+
+    server, port = await _async_start_server(answer_too_long)
+    # the read timeout is not waited for
+    transport = TcpTransport("127.0.0.1", port, False, 5, 30, ApiStats())
+    try:
+        [result] = await asyncio.wait_for(transport.send([(1, COMMAND_INFO)]), 5)
+        assert isinstance(result, ValueError)
+        assert transport._writer is None
+    finally:
+        await transport.close()
+        server.close()
+        await server.wait_closed()
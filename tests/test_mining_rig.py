@@ -0,0 +1,131 @@
+"""Tests of the thermal governor and the entities of the GPUs of a MiningRig."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.nicehash_excavator.const import (
+    ALGORITHM_NONE,
+    CONFIG_GOVERNOR,
+    DEFAULT_GOVERNOR_HYSTERESIS,
+    DEFAULT_GOVERNOR_TEMPERATURE,
+    DOMAIN,
+)
+from custom_components.nicehash_excavator.mining_rig import MiningRig
+
+from .conftest import FIRST_PORT, async_setup_rigs
+
+UUID = "GPU-0000-0000"
+
+
+async def _async_setup_governed_rig(hass: HomeAssistant, fake_rigs) -> MiningRig:
+    """Set up a rig with the governor and frozen telemetry."""
+    entries = await async_setup_rigs(hass, 1, data={CONFIG_GOVERNOR: True})
+    fake_rigs[FIRST_PORT]._drift = lambda: None
+    return hass.data[DOMAIN][entries[0].entry_id]
+
+
+async def _async_set_temperature(
+    hass: HomeAssistant, fake_rigs, mining_rig: MiningRig, temperature: int
+) -> None:
+    """Poll the rig with a temperature of the first GPU."""
+    fake_rigs[FIRST_PORT].devices[0]["gpu_temp"] = temperature
+    await mining_rig.update()
+    await hass.async_block_till_done()
+
+
+async def test_governor_hysteresis(hass: HomeAssistant, fake_rigs) -> None:
+    """A hot GPU is stopped and only resumed once cooled by the hysteresis."""
+    mining_rig = await _async_setup_governed_rig(hass, fake_rigs)
+    fake = fake_rigs[FIRST_PORT]
+    algorithm = fake.workers[0]
+
+    await _async_set_temperature(
+        hass, fake_rigs, mining_rig, DEFAULT_GOVERNOR_TEMPERATURE - 1
+    )
+    assert fake.workers[0] == algorithm
+
+    await _async_set_temperature(
+        hass, fake_rigs, mining_rig, DEFAULT_GOVERNOR_TEMPERATURE
+    )
+    assert 0 not in fake.workers
+    assert mining_rig.governor_stopped == {UUID: fake.algorithms[algorithm]}
+
+    await _async_set_temperature(
+        hass,
+        fake_rigs,
+        mining_rig,
+        DEFAULT_GOVERNOR_TEMPERATURE - DEFAULT_GOVERNOR_HYSTERESIS + 1,
+    )
+    assert 0 not in fake.workers
+
+    await _async_set_temperature(
+        hass,
+        fake_rigs,
+        mining_rig,
+        DEFAULT_GOVERNOR_TEMPERATURE - DEFAULT_GOVERNOR_HYSTERESIS,
+    )
+    assert fake.workers[0] == algorithm
+    assert mining_rig.governor_stopped == {}
+
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_user_command_overrides_governor(hass: HomeAssistant, fake_rigs) -> None:
+    """A GPU stopped by the governor stays stopped after the user selects none."""
+    mining_rig = await _async_setup_governed_rig(hass, fake_rigs)
+    fake = fake_rigs[FIRST_PORT]
+
+    await _async_set_temperature(
+        hass, fake_rigs, mining_rig, DEFAULT_GOVERNOR_TEMPERATURE
+    )
+    assert UUID in mining_rig.governor_stopped
+
+    await hass.services.async_call(
+        "select",
+        "select_option",
+        {"entity_id": "select.rig0_gpu_0_algorithm", "option": ALGORITHM_NONE},
+        blocking=True,
+    )
+    assert mining_rig.governor_stopped == {}
+
+    await _async_set_temperature(hass, fake_rigs, mining_rig, 50)
+    assert 0 not in fake.workers
+
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_replaced_gpu(hass: HomeAssistant, fake_rigs) -> None:
+    """The entities of a GPU are replaced when another GPU takes its id."""
+    entries = await async_setup_rigs(hass, 1)
+    mining_rig = hass.data[DOMAIN][entries[0].entry_id]
+    registry = er.async_get(hass)
+
+    def unique_ids(uuid: str) -> set[str]:
+        return {
+            entry.unique_id
+            for entry in registry.entities.values()
+            if uuid in entry.unique_id
+        }
+
+    old_unique_ids = unique_ids(UUID)
+    state_count = len(hass.states.async_all())
+    assert old_unique_ids
+
+    new_uuid = "GPU-0000-9999"
+    fake_rigs[FIRST_PORT].devices[0]["uuid"] = new_uuid
+    await mining_rig.update()
+    await hass.async_block_till_done()
+
+    assert not unique_ids(UUID)
+    assert {
+        unique_id.replace(new_uuid, UUID) for unique_id in unique_ids(new_uuid)
+    } == old_unique_ids
+    # no unavailable states of the gone GPU are left
+    assert len(hass.states.async_all()) == state_count
+    assert all(state.state != "unavailable" for state in hass.states.async_all())
+
+    assert await hass.config_entries.async_unload(entries[0].entry_id)
@@ -0,0 +1,88 @@
+"""Tests of the publish throttle of the sensors."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.nicehash_excavator.const import (
+    CONFIG_DEADBAND_TEMPERATURE,
+    CONFIG_MAX_PUBLISH_AGE,
+    CONFIG_MIN_PUBLISH_INTERVAL,
+    DOMAIN,
+)
+
+from .conftest import FIRST_PORT, async_setup_rigs
+
+ENTITY_ID = "sensor.rig0_gpu_0_gpu"
+MIN_INTERVAL = 5
+MAX_AGE = 60
+DEADBAND = 2
+
+
+async def test_publish_throttle(hass: HomeAssistant, fake_rigs) -> None:
+    """Writes wait for the minimum interval, skip the deadband up to the max age."""
+    entries = await async_setup_rigs(
+        hass,
+        1,
+        data={
+            CONFIG_MIN_PUBLISH_INTERVAL: MIN_INTERVAL,
+            CONFIG_MAX_PUBLISH_AGE: MAX_AGE,
+            CONFIG_DEADBAND_TEMPERATURE: DEADBAND,
+        },
+    )
+    mining_rig = hass.data[DOMAIN][entries[0].entry_id]
+    fake = fake_rigs[FIRST_PORT]
+    fake._drift = lambda: None
+    writes = []
+
+    @callback
+    def state_changed(event: Event) -> None:
+        if event.data["entity_id"] == ENTITY_ID:
+            writes.append(event.data["new_state"].state)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, state_changed)
+    start_time = dt_util.utcnow()
+    start = 1000.0
+    now = start
+
+    async def at(seconds: float, temperature: int | None = None) -> str:
+        """Move the time, poll a temperature, return the state."""
+        nonlocal now
+        now = start + seconds
+        async_fire_time_changed(hass, start_time + timedelta(seconds=seconds))
+        if temperature is not None:
+            fake.devices[0]["gpu_temp"] = temperature
+            await mining_rig.update()
+        await hass.async_block_till_done()
+        return hass.states.get(ENTITY_ID).state
+
+    with patch(
+        "custom_components.nicehash_excavator.sensor.time.monotonic", lambda: now
+    ):
+        assert await at(0, 58) == "58"
+        # out of the deadband, written after the minimum interval
+        assert await at(1, 63) == "58"
+        assert await at(MIN_INTERVAL + 0.1) == "63"
+        # in the deadband
+        assert await at(7, 64) == "63"
+        # back in the deadband when the minimum interval passed
+        assert await at(8, 70) == "63"
+        assert await at(9, 64) == "63"
+        assert await at(2 * MIN_INTERVAL + 0.2) == "63"
+        assert writes == ["58", "63"]
+
+        # the max age writes the value in the deadband
+        assert await at(MIN_INTERVAL + MAX_AGE + 0.2) == "64"
+        # and an unchanged state, HA would drop it without force_update
+        assert await at(70, 65) == "64"
+        assert await at(71, 64) == "64"
+        assert await at(MIN_INTERVAL + 2 * MAX_AGE + 0.3) == "64"
+        assert writes == ["58", "63", "64", "64"]
+
+    assert await hass.config_entries.async_unload(entries[0].entry_id)
@@ -0,0 +1,65 @@
+"""Tests of the services of the integration."""
+
+from __future__ import annotations
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.nicehash_excavator.const import DOMAIN
+from custom_components.nicehash_excavator.services import SERVICE_SET_ALGORITHM
+
+from .conftest import FIRST_PORT, async_setup_rigs
+
+
+async def _async_set_algorithm(hass: HomeAssistant, data: dict) -> dict:
+    """Call the set_algorithm service, return its response."""
+    return await hass.services.async_call(
+        DOMAIN, SERVICE_SET_ALGORITHM, data, blocking=True, return_response=True
+    )
+
+
+async def test_set_algorithm(hass: HomeAssistant, fake_rigs) -> None:
+    """The response has the result of every targeted GPU."""
+    entries = await async_setup_rigs(hass, 2)
+    fake = fake_rigs[FIRST_PORT]
+    algorithm = fake.algorithms[5]
+
+    response = await _async_set_algorithm(
+        hass, {"entity_id": "select.rig0_gpu_0_algorithm", "algorithm": algorithm}
+    )
+    assert response == {
+        "devices": [{"rig": "rig0", "device": "GPU-0000-0000", "success": True}]
+    }
+    assert fake.workers[0] == 5
+    assert hass.states.get("select.rig0_gpu_0_algorithm").state == algorithm
+
+    # a rig device targets all its GPUs
+    device = dr.async_get(hass).async_get_device({(DOMAIN, "rig1 Excavator")})
+    response = await _async_set_algorithm(
+        hass, {"device_id": device.id, "algorithm": algorithm}
+    )
+    assert sorted(result["device"] for result in response["devices"]) == [
+        f"GPU-0001-{device_id:04d}" for device_id in range(12)
+    ]
+    assert all(
+        result["rig"] == "rig1" and result["success"] for result in response["devices"]
+    )
+    assert set(fake_rigs[FIRST_PORT + 1].workers.values()) == {5}
+
+    response = await _async_set_algorithm(
+        hass, {"entity_id": "select.rig0_gpu_1_algorithm", "algorithm": "unknown"}
+    )
+    assert response == {
+        "devices": [{"rig": "rig0", "device": "GPU-0000-0001", "success": False}]
+    }
+
+    with pytest.raises(ServiceValidationError):
+        await _async_set_algorithm(
+            hass, {"entity_id": "sensor.unknown", "algorithm": algorithm}
+        )
+
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)